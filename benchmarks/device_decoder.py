@@ -0,0 +1,107 @@
+"""Compare the SmartSlydrDevice decoder with the former marshmallow_dataclass path.
+
+Run from the repository root inside the development environment:
+
+    python3 benchmarks/device_decoder.py [--devices N] [--rounds N]
+
+The marshmallow comparison is skipped when marshmallow-dataclass is not
+installed.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import ClassVar
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "custom_components"))
+
+from smartslydr_cloud.api import SmartSlydrDevice  # noqa: E402
+
+try:
+    from marshmallow import Schema
+    from marshmallow_dataclass import dataclass
+except ImportError:
+    MarshmallowDevice = None
+else:
+
+    @dataclass
+    class MarshmallowDevice:
+        """SmartSlydrDevice as it was decoded before."""
+
+        device_id: str
+        devicename: str
+        petpass: str
+        room_name: str
+        room_id: str
+        wlansignal: int
+        temperature: int
+        humidity: int
+        position: int
+        error: str
+        status: str
+        Schema: ClassVar[type[Schema]] = Schema
+
+
+def make_devices(count: int) -> list[dict]:
+    """Return `count` raw devices as found in a `/devices` response."""
+    return [
+        {
+            "device_id": f"device-{index}",
+            "devicename": f"Window {index}",
+            "petpass": "off",
+            "room_name": f"Room {index // 4}",
+            "room_id": str(index // 4),
+            "wlansignal": -60,
+            "temperature": 21,
+            "humidity": 45,
+            "position": index % 101,
+            "error": "",
+            "status": "device is online",
+        }
+        for index in range(count)
+    ]
+
+
+def measure(name: str, load, devices: list[dict], rounds: int) -> None:
+    """Print time and memory needed to decode `devices` with `load`."""
+    seconds = min(
+        timeit.repeat(lambda: [load(device) for device in devices], number=1, repeat=rounds)
+    )
+
+    tracemalloc.start()
+    decoded = [load(device) for device in devices]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del decoded
+
+    print(  # noqa: T201
+        f"{name:<20} {seconds / len(devices) * 1e6:8.2f} us/device"
+        f" {memory / len(devices):8.0f} bytes/device"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    devices = make_devices(args.devices)
+    measure("slotted decoder", SmartSlydrDevice.from_dict, devices, args.rounds)
+    if MarshmallowDevice is not None:
+        measure(
+            "marshmallow",
+            lambda device: MarshmallowDevice.Schema().load(device),
+            devices,
+            args.rounds,
+        )
+    else:
+        print("marshmallow-dataclass not installed, skipping comparison")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Drive LycheeThingsApiClient and the coordinator against the mock cloud.
+
+Reports requests per poll, poll latency, command-to-state latency and CPU
+time per device. Run from the repository root inside the development
+environment:
+
+    python3 benchmarks/end_to_end.py --rooms 5 --devices-per-room 4 --latency 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "custom_components"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from mock_cloud import MockCloud  # noqa: E402
+from smartslydr_cloud.api import LycheeThingsApiClient  # noqa: E402
+from smartslydr_cloud.const import DEFAULT_SYNC_INTERVAL  # noqa: E402
+from smartslydr_cloud.coordinator import SmartSlydrCloudUpdateCoordinator  # noqa: E402
+
+
+# With fewer samples the 95th percentile is hardly more than the maximum
+MIN_P95_SAMPLES = 20
+
+
+def _p95(latencies: list[float]) -> str:
+    """Return the 95th percentile latency, formatted, or n/a."""
+    if len(latencies) < MIN_P95_SAMPLES:
+        return f"{'n/a':>7}   "
+    return f"{statistics.quantiles(latencies, n=20)[-1] * 1000:7.1f} ms"
+
+
+def report(name: str, cloud: MockCloud, latencies: list[float], cpu: float, devices: int) -> None:
+    """Print the statistics of one benchmark."""
+    polls = len(latencies)
+    print(  # noqa: T201
+        f"{name:<22}"
+        f" requests/run {sum(cloud.requests.values()) / polls:5.2f}"
+        f"  latency mean {statistics.fmean(latencies) * 1000:7.1f} ms"
+        f"  p95 {_p95(latencies)}"
+        f"  cpu/device {cpu / polls / devices * 1e6:7.1f} us"
+        f"  errors {sum(cloud.errors.values())}"
+    )
+    if cloud.requests:
+        print(f"{'':<22} {dict(cloud.requests)}")  # noqa: T201
+
+
+async def bench_client(cloud: MockCloud, client: LycheeThingsApiClient, polls: int) -> None:
+    """Poll the device list with the bare client."""
+    cloud.reset_counters()
+    latencies = []
+    cpu = time.process_time()
+    for _ in range(polls):
+        start = time.perf_counter()
+        await client.getDeviceList()
+        latencies.append(time.perf_counter() - start)
+    report("client poll", cloud, latencies, time.process_time() - cpu, len(cloud.devices))
+
+
+async def bench_coordinator(
+    cloud: MockCloud, coordinator: SmartSlydrCloudUpdateCoordinator, polls: int
+) -> None:
+    """Refresh the coordinator like the scheduled poll does."""
+    cloud.reset_counters()
+    latencies = []
+    cpu = time.process_time()
+    for _ in range(polls):
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        latencies.append(time.perf_counter() - start)
+    report(
+        "coordinator poll", cloud, latencies, time.process_time() - cpu, len(cloud.devices)
+    )
+
+
+async def bench_command(
+    cloud: MockCloud,
+    coordinator: SmartSlydrCloudUpdateCoordinator,
+    commands: int,
+    timeout: float,
+) -> None:
+    """Measure the time from a position command until the new state is known."""
+    cloud.reset_counters()
+    latencies = []
+    cpu = time.process_time()
+    device_id = next(iter(cloud.devices))
+    for index in range(commands):
+        target = 100 if index % 2 == 0 else 0
+        reached = asyncio.Event()
+
+        def check(device_id=device_id, target=target, reached=reached) -> None:
+            if coordinator.data[device_id].position == target:
+                reached.set()
+
+        remove = coordinator.async_add_listener(check, device_id)
+        start = time.perf_counter()
+        try:
+            await coordinator.client.setPosition(device_id, target)
+            coordinator.async_track_motion(device_id, target)
+            await asyncio.wait_for(reached.wait(), timeout)
+        except asyncio.TimeoutError:
+            print(f"command to {target} not confirmed within {timeout}s")  # noqa: T201
+            continue
+        finally:
+            remove()
+        latencies.append(time.perf_counter() - start)
+
+    if latencies:
+        report("command to state", cloud, latencies, time.process_time() - cpu, 1)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run all benchmarks."""
+    cloud = MockCloud(
+        rooms=args.rooms,
+        devices_per_room=args.devices_per_room,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        speed=args.speed,
+    )
+    url = await cloud.start()
+
+    hass = HomeAssistant()
+    hass.config.config_dir = tempfile.mkdtemp()
+
+    async with aiohttp.ClientSession() as session:
+        client = LycheeThingsApiClient(cloud.username, cloud.password, session)
+        client.base_url = url
+        await client.getSecurityTokens()
+
+        coordinator = SmartSlydrCloudUpdateCoordinator(
+            hass=hass, client=client, update_interval=DEFAULT_SYNC_INTERVAL
+        )
+
+        print(  # noqa: T201
+            f"{len(cloud.devices)} devices, latency {args.latency * 1000:.0f} ms,"
+            f" error rate {args.error_rate:.0%}"
+        )
+        await bench_client(cloud, client, args.polls)
+        await bench_coordinator(cloud, coordinator, args.polls)
+        await bench_command(cloud, coordinator, args.commands, args.command_timeout)
+
+        coordinator.async_stop()
+
+    await hass.async_stop(force=True)
+    await cloud.stop()
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=4)
+    parser.add_argument("--devices-per-room", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--speed", type=float, default=50.0)
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--commands", type=int, default=2)
+    parser.add_argument("--command-timeout", type=float, default=60.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Local stand-in for the LycheeThings cloud API.
+
+Implements `/auth`, `/token`, `/devices`, `/operation` and `/operation/get`
+with a configurable number of rooms and devices, response latency, error
+rate and simulated door motion. Point `LycheeThingsApiClient.base_url` at
+`MockCloud.url` to use it.
+
+Run standalone from the repository root:
+
+    python3 benchmarks/mock_cloud.py --rooms 4 --devices-per-room 5 --port 8080
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+
+@dataclass
+class MockDevice:
+    """A simulated SmartSlydr opener."""
+
+    device_id: str
+    devicename: str
+    room_id: str
+    room_name: str
+    speed: float
+    position: float = 0.0
+    target: float = 0.0
+    updated: float = field(default_factory=time.monotonic)
+    online: bool = True
+
+    def move(self) -> None:
+        """Advance the simulated motion to now."""
+        now = time.monotonic()
+        step = self.speed * (now - self.updated)
+        self.updated = now
+        if self.position < self.target:
+            self.position = min(self.position + step, self.target)
+        else:
+            self.position = max(self.position - step, self.target)
+
+    def as_dict(self) -> dict:
+        """Return the device as found in a `/devices` response."""
+        self.move()
+        return {
+            "device_id": self.device_id,
+            "devicename": self.devicename,
+            "petpass": "off",
+            "room_name": self.room_name,
+            "room_id": self.room_id,
+            "wlansignal": -60,
+            "temperature": 21,
+            "humidity": 45,
+            "position": int(self.position),
+            "error": "",
+            "status": "device is online" if self.online else "device is offline",
+        }
+
+
+def _make_token(lifetime: float) -> str:
+    """Return a JWT-shaped token expiring after `lifetime` seconds."""
+    payload = json.dumps({"exp": time.time() + lifetime, "jti": random.random()})
+    encoded = base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+    return f"mock.{encoded}.signature"
+
+
+class MockCloud:
+    """aiohttp server simulating the LycheeThings cloud."""
+
+    def __init__(
+        self,
+        rooms: int = 2,
+        devices_per_room: int = 3,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        speed: float = 10.0,
+        token_lifetime: float = 3600,
+        username: str = "user",
+        password: str = "password",
+    ) -> None:
+        """Initialize the mock cloud.
+
+        `latency` is added to every response, `error_rate` is the fraction of
+        requests answered with a 503 and `speed` is the door speed in percent
+        per second.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.token_lifetime = token_lifetime
+        self.username = username
+        self.password = password
+
+        self.devices = {
+            device.device_id: device
+            for device in (
+                MockDevice(
+                    device_id=f"room{room}-device{index}",
+                    devicename=f"Window {room}.{index}",
+                    room_id=str(room),
+                    room_name=f"Room {room}",
+                    speed=speed,
+                )
+                for room in range(rooms)
+                for index in range(devices_per_room)
+            )
+        }
+        self.requests: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+
+        self._access_tokens: dict[str, float] = {}
+        self._refresh_tokens: set[str] = set()
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_post("/auth", self._auth)
+        self.app.router.add_post("/token", self._token)
+        self.app.router.add_get("/devices", self._devices)
+        self.app.router.add_post("/operation", self._operation)
+        self.app.router.add_post("/operation/get", self._operation_get)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        self.url = f"http://{host}:{port}/"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_counters(self) -> None:
+        """Forget the requests counted so far."""
+        self.requests.clear()
+        self.errors.clear()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count requests and add latency and random failures."""
+        endpoint = request.path.strip("/")
+        self.requests[endpoint] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency * random.uniform(0.5, 1.5))
+        if random.random() < self.error_rate:
+            self.errors[endpoint] += 1
+            return web.Response(status=503, text="Service Unavailable")
+        if endpoint not in ("auth", "token") and not self._authorized(request):
+            self.errors[endpoint] += 1
+            return web.json_response({"message": "Unauthorized"}, status=401)
+        return await handler(request)
+
+    def _authorized(self, request: web.Request) -> bool:
+        """Return True if the request carries a valid access token."""
+        expires = self._access_tokens.get(request.headers.get("Authorization", ""))
+        return expires is not None and expires > time.time()
+
+    def _issue_access_token(self) -> str:
+        token = _make_token(self.token_lifetime)
+        self._access_tokens[token] = time.time() + self.token_lifetime
+        return token
+
+    async def _auth(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if (body.get("username"), body.get("password")) != (self.username, self.password):
+            return web.json_response({"message": "Invalid credentials"}, status=401)
+        refresh_token = f"refresh-{random.random()}"
+        self._refresh_tokens.add(refresh_token)
+        return web.json_response(
+            {
+                "access_token": self._issue_access_token(),
+                "refresh_token": refresh_token,
+            }
+        )
+
+    async def _token(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if body.get("refresh_token") not in self._refresh_tokens:
+            return web.json_response({"message": "Invalid refresh token"}, status=400)
+        return web.json_response({"access_token": self._issue_access_token()})
+
+    async def _devices(self, request: web.Request) -> web.Response:
+        rooms: dict[str, dict] = {}
+        for device in self.devices.values():
+            room = rooms.setdefault(
+                device.room_id,
+                {
+                    "room_id": device.room_id,
+                    "room_name": device.room_name,
+                    "device_list": [],
+                },
+            )
+            room["device_list"].append(device.as_dict())
+        return web.json_response({"room_lists": list(rooms.values())})
+
+    async def _operation(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        for setcommand in body["setcommands"]:
+            device = self.devices[setcommand["device_id"]]
+            for command in setcommand["commands"]:
+                if command["key"] == "position":
+                    device.move()
+                    device.target = float(command["value"])
+        return web.json_response({"message": "success"})
+
+    async def _operation_get(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        response = []
+        for command in body["commands"]:
+            device = self.devices[command["device_id"]]
+            device.move()
+            response.append(
+                {"device_id": device.device_id, "position": int(device.position)}
+            )
+        return web.json_response({"response": response})
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    cloud = MockCloud(
+        rooms=args.rooms,
+        devices_per_room=args.devices_per_room,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        speed=args.speed,
+    )
+    url = await cloud.start(port=args.port)
+    print(f"Mock LycheeThings cloud listening on {url} (user/password)")  # noqa: T201
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await cloud.stop()
+
+
+def main() -> None:
+    """Run the mock cloud until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=2)
+    parser.add_argument("--devices-per-room", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--speed", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8080)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
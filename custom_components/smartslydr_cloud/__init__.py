@@ -8,19 +8,22 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.exceptions import ConfigEntryNotReady, ConfigEntryAuthFailed
-
-from .api import (
-    LycheeThingsApiClient,
-    LycheeThingsApiClientAuthenticationError,
-    LycheeThingsApiClientError,
-)
-from .const import DOMAIN, CONF_SYNC_INTERVAL, DEFAULT_SYNC_INTERVAL
+from homeassistant.helpers.storage import Store
+from homeassistant.exceptions import ConfigEntryNotReady
+
+from .const import DOMAIN, CONF_SYNC_INTERVAL, DEFAULT_SYNC_INTERVAL, STORAGE_VERSION
 from .coordinator import SmartSlydrCloudUpdateCoordinator
+from .services import async_setup_services, async_unload_services
+from .session import async_acquire_client, async_release_client
+
+# Stores of the entries by entry_id, kept across reloads so a pending
+# delayed save is written or removed through the same instance
+DATA_STORES = f"{DOMAIN}_stores"
 
 PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
     Platform.COVER,
+    Platform.SENSOR,
 ]
 
 
@@ -32,31 +35,38 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     sync_interval = entry.options.get(CONF_SYNC_INTERVAL, DEFAULT_SYNC_INTERVAL)
 
-    client = LycheeThingsApiClient(
-            username=entry.data[CONF_USERNAME],
-            password=entry.data[CONF_PASSWORD],
-            session=async_get_clientsession(hass),
-        )
-
-    try:
-        await client.getSecurityTokens()
-    except LycheeThingsApiClientAuthenticationError as err:
-        raise ConfigEntryAuthFailed(err) from err
-    except LycheeThingsApiClientError as err:
-        raise ConfigEntryNotReady(err) from err
+    client = async_acquire_client(
+        hass, entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD]
+    )
 
     hass.data[DOMAIN][entry.entry_id] = coordinator = SmartSlydrCloudUpdateCoordinator(
         hass=hass,
         client=client,
         update_interval=sync_interval,
+        store=_async_get_store(hass, entry),
     )
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
 
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady
+    try:
+        if await coordinator.async_restore_cache():
+            # Set up the covers from the cache and reconcile with the cloud later
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh(), f"{DOMAIN} initial refresh"
+            )
+        else:
+            # The client logs in on the first request; authentication errors
+            # surface as ConfigEntryAuthFailed from the first refresh.
+            # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+            await coordinator.async_config_entry_first_refresh()
+
+            if not coordinator.last_update_success:
+                raise ConfigEntryNotReady
+    except Exception:
+        hass.data[DOMAIN].pop(entry.entry_id).async_stop()
+        await async_release_client(hass, client)
+        raise
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_setup_services(hass)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
@@ -65,10 +75,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.async_stop()
+        await coordinator.async_save_cache()
+        await async_release_client(hass, coordinator.client)
+        async_unload_services(hass)
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached tokens and devices of a deleted entry."""
+    store = _async_get_store(hass, entry)
+    hass.data[DATA_STORES].pop(entry.entry_id)
+    await store.async_remove()
+
+
+def _async_get_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store caching tokens and devices of `entry`."""
+    stores: dict[str, Store] = hass.data.setdefault(DATA_STORES, {})
+    if (store := stores.get(entry.entry_id)) is None:
+        store = stores[entry.entry_id] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}", private=True
+        )
+    return store
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
@@ -8,21 +8,95 @@ Lycheethings SmartSlydr devices into HomeAssistant.
 from __future__ import annotations
 
 
+import asyncio
+import base64
+import bisect
+import contextlib
+import heapq
+import itertools
+import json as jsonlib
+import logging
+import random
+import socket
+import time
 import traceback
-from typing import ClassVar
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any
 import aiohttp
+import async_timeout
 
-from marshmallow_dataclass import dataclass  # noqa: D100
-from marshmallow import Schema
+from .const import LOGGER, BASE_API_URL, DOMAIN, MAX_CONCURRENT_REQUESTS
 
-from .const import LOGGER, BASE_API_URL, DOMAIN
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    json_loads = jsonlib.loads
 
 HEADERS = {
     "Accept-Encoding": "gzip",
     "User-Agent": "Mozilla/5.0",
 }
 
-@dataclass
+# Lifetime assumed for an access token that carries no expiry information,
+# until a 401 teaches us the real one.
+DEFAULT_TOKEN_LIFETIME = 3600  # seconds
+# Refresh this long before the token is expected to expire.
+TOKEN_REFRESH_MARGIN = 60  # seconds
+# Never trust a learned lifetime shorter than this.
+MIN_TOKEN_LIFETIME = 120  # seconds
+
+# Give up on a single request after this long.
+REQUEST_TIMEOUT = 10  # seconds
+# Retry timeouts, connection errors and 5xx answers this often ...
+REQUEST_RETRIES = 2
+# ... waiting about this long before the first retry, doubling afterwards.
+RETRY_BACKOFF = 0.5  # seconds
+
+# Stop sending requests after this many failures in a row ...
+CIRCUIT_FAILURE_THRESHOLD = 5
+# ... and probe the cloud again after this long, or after Retry-After.
+CIRCUIT_RESET_TIMEOUT = 30  # seconds
+# Never honour a Retry-After longer than this.
+MAX_RETRY_AFTER = 3600  # seconds
+
+# Request slots kept free for commands, so a click never waits behind polls
+COMMAND_RESERVED_REQUESTS = 1
+
+# Lanes of the request scheduler, lower numbers go first
+PRIORITY_COMMAND = 0
+PRIORITY_VERIFY = 1
+PRIORITY_POLL = 2
+
+# Upper bounds of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)  # seconds
+
+
+def _as_str(value: Any) -> str:
+    """Coerce a device field to str."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise TypeError(f"Not a valid string: {value!r}")
+
+
+def _as_int(value: Any) -> int:
+    """Coerce a device field to int."""
+    if isinstance(value, bool):
+        raise TypeError(f"Not a valid integer: {value!r}")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        # Truncated like the marshmallow schema this replaced
+        return int(value)
+    if isinstance(value, str):
+        return int(value)
+    raise TypeError(f"Not a valid integer: {value!r}")
+
+
+@dataclass(slots=True)
 class SmartSlydrDevice:
     """SmartSlydr Device Class Definition."""
 
@@ -37,7 +111,87 @@ class SmartSlydrDevice:
     position: int
     error: str
     status: str
-    Schema: ClassVar[type[Schema]] = Schema
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SmartSlydrDevice:
+        """Decode a device from the `device_list` of a `/devices` response.
+
+        Unknown keys are ignored; a missing or malformed field raises ValueError.
+        """
+        kwargs = {}
+        for name, convert in _DEVICE_FIELDS:
+            try:
+                kwargs[name] = convert(data[name])
+            except (KeyError, TypeError, ValueError) as ex:
+                raise ValueError(
+                    f"Invalid device field {name!r}: {data.get(name)!r}"
+                ) from ex
+        return cls(**kwargs)
+
+
+_DEVICE_FIELDS = (
+    ("device_id", _as_str),
+    ("devicename", _as_str),
+    ("petpass", _as_str),
+    ("room_name", _as_str),
+    ("room_id", _as_str),
+    ("wlansignal", _as_int),
+    ("temperature", _as_int),
+    ("humidity", _as_int),
+    ("position", _as_int),
+    ("error", _as_str),
+    ("status", _as_str),
+)
+
+
+@dataclass
+class LycheeThingsTimingStats:
+    """Count, errors and latency histogram of requests or polls."""
+
+    count: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    last_time: float = 0.0
+    # Time spent decoding responses, not included in total_time
+    parse_time: float = 0.0
+    histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+    def record(self, seconds: float, error: bool = False) -> None:
+        """Record one request or poll that took `seconds`."""
+        self.count += 1
+        self.errors += error
+        self.total_time += seconds
+        self.max_time = max(self.max_time, seconds)
+        self.last_time = seconds
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    @property
+    def mean_time(self) -> float | None:
+        """Return the mean duration in seconds."""
+        return self.total_time / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics with durations in milliseconds."""
+        mean_time = self.mean_time
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": None if mean_time is None else round(mean_time * 1000, 1),
+            "max_ms": round(self.max_time * 1000, 1),
+            "last_ms": round(self.last_time * 1000, 1),
+            "parse_ms": round(self.parse_time * 1000, 1),
+            "histogram": {
+                **{
+                    f"<={bound * 1000:g}ms": count
+                    for bound, count in zip(LATENCY_BUCKETS, self.histogram)
+                },
+                f">{LATENCY_BUCKETS[-1] * 1000:g}ms": self.histogram[-1],
+            },
+        }
+
 
 class LycheeThingsApiClientError(Exception):
     """Exception to indicate a general API error."""
@@ -55,6 +209,304 @@ class LycheeThingsApiClientAuthenticationError(
     """Exception to indicate an authentication error."""
 
 
+class LycheeThingsApiClientCircuitOpenError(
+    LycheeThingsApiClientCommunicationError
+):
+    """Exception to indicate that requests are paused after repeated failures."""
+
+    def __init__(self, retry_in: float) -> None:
+        """Initialize with the seconds until the cloud is probed again."""
+        super().__init__(
+            f"LycheeThings cloud unavailable, retrying in {retry_in:.0f}s"
+        )
+        self.retry_in = retry_in
+
+
+class LycheeThingsApiClientSupersededError(LycheeThingsApiClientError):
+    """Exception to indicate that a newer request replaced a queued one."""
+
+
+def _retry_after(value: str | None) -> float | None:
+    """Return the seconds to wait from a Retry-After header, if any."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0), MAX_RETRY_AFTER)
+
+
+def _jwt_expiry(token: str) -> float | None:
+    """Return the `exp` claim (epoch seconds) of a JWT, or None if unavailable."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(jsonlib.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class LycheeThingsCircuitBreaker:
+    """Stop sending requests while the cloud keeps failing.
+
+    After `threshold` failures in a row, or when the API asks to back off
+    with Retry-After, the circuit opens and requests fail fast. Once the
+    reset timeout passed it is half-open: a single probe request is let
+    through and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+        # A probe that never reports back (e.g. cancelled) expires
+        self._probe_until = 0.0
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until requests are let through again."""
+        return max(self.retry_at - time.monotonic(), 0)
+
+    def before_request(self) -> None:
+        """Raise LycheeThingsApiClientCircuitOpenError if requests are paused."""
+        if self.state == self.CLOSED:
+            return
+
+        now = time.monotonic()
+        if self.state == self.OPEN and now >= self.retry_at:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and now >= self._probe_until:
+            self._probe_until = now + REQUEST_TIMEOUT
+            return
+        raise LycheeThingsApiClientCircuitOpenError(
+            max(self.retry_in, self._probe_until - now)
+        )
+
+    def record_success(self) -> None:
+        """Close the circuit after the cloud answered."""
+        if self.state != self.CLOSED:
+            LOGGER.info("%s - LycheeThings cloud is reachable again", DOMAIN)
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_until = 0.0
+
+    def record_failure(self, retry_after: float | None = None) -> None:
+        """Count a failed request and open the circuit if required."""
+        self.failures += 1
+        self._probe_until = 0.0
+        if (
+            self.state == self.CLOSED
+            and self.failures < self.threshold
+            and retry_after is None
+        ):
+            return
+
+        if self.state == self.CLOSED:
+            LOGGER.warning(
+                "%s - LycheeThings cloud unavailable, pausing requests for %.0fs",
+                DOMAIN,
+                max(retry_after or 0, self.reset_timeout),
+            )
+        self.state = self.OPEN
+        self.retry_at = time.monotonic() + max(retry_after or 0, self.reset_timeout)
+
+
+class LycheeThingsRequestScheduler:
+    """Hand out request slots by priority.
+
+    At most `limit` requests run at once, `reserved` of them only for
+    commands. Waiting requests start by priority, then in order of arrival.
+    A request still waiting when a newer one with the same key arrives is
+    superseded and fails with LycheeThingsApiClientSupersededError.
+    """
+
+    def __init__(
+        self, limit: int, reserved: int = COMMAND_RESERVED_REQUESTS
+    ) -> None:
+        """Initialize the scheduler."""
+        self.limit = limit
+        self.reserved = min(reserved, limit - 1)
+        self.active = 0
+        self.superseded = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._keys: dict[Hashable, asyncio.Future] = {}
+        self._order = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return sum(not future.done() for _, _, future in self._waiters)
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, priority: int, key: Hashable | None = None
+    ) -> AsyncIterator[None]:
+        """Wait for a slot of lane `priority` and hold it."""
+        if key is not None and (older := self._keys.pop(key, None)) is not None:
+            if not older.done():
+                older.set_exception(LycheeThingsApiClientSupersededError())
+                self.superseded += 1
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        self._start_waiting()
+        if not future.done() and key is not None:
+            self._keys[key] = future
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Hand on a slot granted just before the cancellation
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+        finally:
+            if key is not None and self._keys.get(key) is future:
+                del self._keys[key]
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        """Return a slot and start the next waiting request."""
+        self.active -= 1
+        self._start_waiting()
+
+    def _start_waiting(self) -> None:
+        """Start waiting requests while their lane has free slots."""
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                # Cancelled or superseded
+                heapq.heappop(self._waiters)
+                continue
+            limit = self.limit
+            if priority != PRIORITY_COMMAND:
+                limit -= self.reserved
+            if self.active >= limit:
+                return
+            heapq.heappop(self._waiters)
+            self.active += 1
+            future.set_result(None)
+
+
+class LycheeThingsTokenManager:
+    """Keep track of the access token and refresh it only when needed.
+
+    The expiry is taken from the `expires_in` field of the token response,
+    the JWT `exp` claim or, failing both, from a lifetime learned from the
+    first 401 the API returns. Concurrent callers share a single refresh.
+    """
+
+    def __init__(
+        self,
+        login: Callable[[], Awaitable[bool]],
+        refresh: Callable[[], Awaitable[bool]],
+    ) -> None:
+        """Initialize the token manager."""
+        self._login = login
+        self._refresh = refresh
+        self._lock = asyncio.Lock()
+        self._lifetime: float = DEFAULT_TOKEN_LIFETIME
+
+        self.access_token = ""
+        self.refresh_token = ""
+        self.issued_at = 0.0
+        self.expires_at = 0.0
+
+    def set_tokens(
+        self,
+        access_token: str,
+        refresh_token: str | None = None,
+        expires_in: float | None = None,
+    ) -> None:
+        """Store a freshly issued access token (and refresh token)."""
+        now = time.monotonic()
+        self.access_token = access_token
+        if refresh_token is not None:
+            self.refresh_token = refresh_token
+        self.issued_at = now
+
+        if expires_in is None and (exp := _jwt_expiry(access_token)) is not None:
+            expires_in = exp - time.time()
+        if expires_in is None:
+            expires_in = self._lifetime
+        self.expires_at = now + max(expires_in - TOKEN_REFRESH_MARGIN, 0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tokens in a form that can be stored."""
+        return {
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "expires": time.time() + self.expires_at - time.monotonic(),
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Restore tokens saved with `as_dict`."""
+        self.access_token = data.get("access_token", "")
+        self.refresh_token = data.get("refresh_token", "")
+        self.issued_at = time.monotonic()
+        self.expires_at = self.issued_at + data.get("expires", 0) - time.time()
+
+    @property
+    def valid(self) -> bool:
+        """Return True if the access token can still be used."""
+        return bool(self.access_token) and time.monotonic() < self.expires_at
+
+    def invalidate(self, access_token: str) -> None:
+        """Mark `access_token` as rejected by the API.
+
+        Only the token that was actually rejected is dropped, so several
+        requests failing with the same token cause a single refresh.
+        """
+        if access_token != self.access_token or not self.valid:
+            return
+        age = time.monotonic() - self.issued_at
+        if age >= MIN_TOKEN_LIFETIME and _jwt_expiry(access_token) is None:
+            self._lifetime = min(self._lifetime, age)
+        self.expires_at = 0.0
+
+    async def async_get_access_token(self) -> str:
+        """Return a valid access token, refreshing or logging in if needed."""
+        if self.valid:
+            return self.access_token
+
+        async with self._lock:
+            # Another caller may have refreshed while we were waiting.
+            if self.valid:
+                return self.access_token
+
+            if self.refresh_token:
+                try:
+                    await self._refresh()
+                except LycheeThingsApiClientAuthenticationError:
+                    LOGGER.debug(
+                        "%s - refresh token rejected, logging in again", DOMAIN
+                    )
+                    self.refresh_token = ""
+                    await self._login()
+            else:
+                await self._login()
+
+            return self.access_token
+
+
 class LycheeThingsApiClient:
     """LycheeThings API Client."""
 
@@ -63,22 +515,213 @@ class LycheeThingsApiClient:
         username: str,
         password: str,
         session: aiohttp.ClientSession,
+        scheduler: LycheeThingsRequestScheduler | None = None,
     ) -> None:
-        """Initialize Class."""
+        """Initialize Class.
+
+        `scheduler` orders and caps concurrent requests, it may be shared by
+        several clients.
+        """
         self.base_url = BASE_API_URL
         self.headers = HEADERS
-        self.debug = True
         self.username = username
         self.password = password
 
-        self.access_token = ""
-        self.refresh_token = ""
+        self._tokens = LycheeThingsTokenManager(
+            login=self.getSecurityTokens,
+            refresh=self.refreshAccessToken,
+        )
 
         self._session = session
+        # Request statistics by endpoint, e.g. "devices"
+        self.stats: dict[str, LycheeThingsTimingStats] = {}
+        self._breaker = LycheeThingsCircuitBreaker()
+        self._scheduler = scheduler or LycheeThingsRequestScheduler(
+            MAX_CONCURRENT_REQUESTS
+        )
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        # Keys of requests holding a scheduler slot, i.e. sent to the cloud
+        self._sent: set[Hashable] = set()
+
+    @property
+    def access_token(self) -> str:
+        """Return the current access token."""
+        return self._tokens.access_token
+
+    @property
+    def refresh_token(self) -> str:
+        """Return the current refresh token."""
+        return self._tokens.refresh_token
+
+    def export_tokens(self) -> dict[str, Any]:
+        """Return the current tokens so they can be stored."""
+        return self._tokens.as_dict()
+
+    def restore_tokens(self, data: dict[str, Any]) -> None:
+        """Reuse tokens returned by `export_tokens`, e.g. after a restart."""
+        self._tokens.restore(data)
+
+    @property
+    def scheduler(self) -> LycheeThingsRequestScheduler:
+        """Return the scheduler ordering the requests of this client."""
+        return self._scheduler
+
+    @property
+    def circuit_state(self) -> str:
+        """Return the state of the circuit breaker: closed, open or half_open."""
+        return self._breaker.state
+
+    @property
+    def circuit_retry_in(self) -> float:
+        """Return the seconds until paused requests are let through again."""
+        return self._breaker.retry_in
+
+    @property
+    def debug(self) -> bool:
+        """Return True if debug messages are logged."""
+        return LOGGER.isEnabledFor(logging.DEBUG)
 
     def Debug_Message(self, name: str, message: str) -> None:  # noqa: D102
-        if self.debug:
-            LOGGER.debug(f"{DOMAIN} - {name}: {message}")  # noqa: G004
+        LOGGER.debug("%s - %s: %s", DOMAIN, name, message)
+
+    ##****************************************************************************************
+    #
+    #       _api_wrapper	-	Send a request, read and decode the response exactly once
+    #
+    ##****************************************************************************************
+
+    async def _api_wrapper(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        headers: dict,
+        json: dict | None = None,
+        log_body: bool = True,
+        auth_statuses: tuple[int, ...] = (401, 403),
+        priority: int = PRIORITY_COMMAND,
+        key: Hashable | None = None,
+    ) -> Any:
+        """Send a request and return its decoded JSON body.
+
+        The request waits for a slot of lane `priority`; a newer request
+        with the same `key` supersedes it while it waits. Timeouts,
+        connection errors, 429 and 5xx answers are retried with jittered
+        exponential backoff; while they keep failing the circuit breaker
+        makes requests fail fast. The body is read once and log strings are
+        only built when debug logging is enabled.
+        """
+        for attempt in range(REQUEST_RETRIES + 1):
+            self._breaker.before_request()
+            if attempt:
+                delay = RETRY_BACKOFF * 2 ** (attempt - 1) * (0.5 + random.random())
+                self.Debug_Message(name, f"retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+            if self.debug:
+                self.Debug_Message(name, f"{method.upper()} {url}")
+
+            stats = self.stats.setdefault(
+                url.removeprefix(self.base_url), LycheeThingsTimingStats()
+            )
+            try:
+                async with self._scheduler.slot(priority, key):
+                    start = time.perf_counter()
+                    self._sent.add(key)
+                    try:
+                        async with async_timeout.timeout(
+                            REQUEST_TIMEOUT
+                        ), self._session.request(
+                            method, url, headers=headers, json=json
+                        ) as response:
+                            status = response.status
+                            retry_after = _retry_after(
+                                response.headers.get("Retry-After")
+                            )
+                            body = await response.read()
+                    finally:
+                        elapsed = time.perf_counter() - start
+                        self._sent.discard(key)
+            except asyncio.TimeoutError as exception:
+                stats.record(elapsed, error=True)
+                self._breaker.record_failure()
+                error, cause = f"{name}: timeout after {REQUEST_TIMEOUT}s", exception
+                continue
+            except (aiohttp.ClientError, socket.gaierror) as exception:
+                stats.record(elapsed, error=True)
+                self._breaker.record_failure()
+                error, cause = f"{name}: {exception!r}", exception
+                continue
+            stats.record(elapsed, error=status >= 400)
+
+            if self.debug:
+                self.Debug_Message(
+                    name,
+                    f"response.status = {status}"
+                    + (
+                        f" - response.text= {body.decode(errors='replace')}"
+                        if log_body or not 200 <= status < 300
+                        else ""
+                    ),
+                )
+
+            if status == 429 or status >= 500:
+                self._breaker.record_failure(retry_after)
+                error, cause = f"{name} failed: {status}", None
+                continue
+
+            self._breaker.record_success()
+            if status in auth_statuses:
+                raise LycheeThingsApiClientAuthenticationError(
+                    f"{name} failed: {status}"
+                )
+            if not 200 <= status < 300:
+                raise LycheeThingsApiClientError(f"{name} failed: {status}")
+
+            start = time.perf_counter()
+            try:
+                return json_loads(body) if body else None
+            except ValueError as exception:
+                raise LycheeThingsApiClientError(
+                    f"{name}: invalid JSON response"
+                ) from exception
+            finally:
+                stats.parse_time += time.perf_counter() - start
+
+        raise LycheeThingsApiClientCommunicationError(error) from cause
+
+    ##****************************************************************************************
+    #
+    #       _single_flight	-	Share one in-flight read between concurrent callers
+    #
+    ##****************************************************************************************
+
+    async def _single_flight(
+        self, key: Hashable, factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Await `factory()`, sharing the call with everyone asking for `key`.
+
+        A caller being cancelled does not cancel the read for the others.
+        Callers of a read superseded while it waited get the newer result.
+        """
+        while True:
+            if (task := self._in_flight.get(key)) is None:
+                task = self._in_flight[key] = asyncio.ensure_future(factory())
+                task.add_done_callback(
+                    lambda done, key=key: self._done_in_flight(key, done)
+                )
+            try:
+                return await asyncio.shield(task)
+            except LycheeThingsApiClientSupersededError:
+                continue
+
+    def _done_in_flight(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished read."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieve the exception in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
 
     ##****************************************************************************************
     #
@@ -87,11 +730,8 @@ class LycheeThingsApiClient:
     ##****************************************************************************************
 
     async def getSecurityTokens(self):  # noqa: D102
-        session = self._session
-
         # Create URL
         url = self.base_url + "auth"
-        self.Debug_Message("Get_Security_Tokens", "URL: " + url)
 
         json = {"username": self.username ,"password": self.password  }
 
@@ -100,48 +740,22 @@ class LycheeThingsApiClient:
         try:
             myheaders = {**self.headers, "Content-Type": "application/json", "Accept": "*/*"}
 
-            response = await session.post(url, headers=myheaders, json=json)
-
-            if response.status in (401, 403):
-                self.Debug_Message(
-                    "Get_Security_Tokens",
-                    "Auth failed - response.status = " + str(response.status),
-                )
-                raise LycheeThingsApiClientAuthenticationError(
-                    "Invalid credentials"
-                )
-            if (response.status < 200) or (response.status >= 300):
-                self.Debug_Message(
-                    "Get_Security_Tokens",
-                    "Error - response.status = " + str(response.status),
-                )
-                self.Debug_Message(
-                    "Get_Security_Tokens", "Error - response.text= " + await response.text()
-                )
-                raise LycheeThingsApiClientCommunicationError(
-                    f"Server error: {response.status}"
-                )
-
-            else:
-                self.Debug_Message(
-                    "Get_Security_Tokens",
-                    "Success " + await response.text(),
-                )
-
-                jsonResponse = await response.json()
-                self.access_token = jsonResponse["access_token"]
-
-                # self.Debug_Message(
-                #     "Get_Security_Tokens", "Access Token = " + self.access_token
-                # )
-                self.refresh_token = jsonResponse["refresh_token"]
+            jsonResponse = await self._api_wrapper(
+                "Get_Security_Tokens", "post", url, myheaders, json, log_body=False
+            )
 
-                # self.Debug_Message(
-                #     "Get_Security_Tokens", "Refresh Token = " + self.refresh_token
-                # )
+            self._tokens.set_tokens(
+                jsonResponse["access_token"],
+                jsonResponse["refresh_token"],
+                jsonResponse.get("expires_in"),
+            )
 
-                return True
+            return True
 
+        except LycheeThingsApiClientAuthenticationError as ex:
+            raise LycheeThingsApiClientAuthenticationError(
+                "Invalid credentials"
+            ) from ex
         except LycheeThingsApiClientError:
             raise
         except Exception as ex:
@@ -159,14 +773,10 @@ class LycheeThingsApiClient:
     ##****************************************************************************************
 
     async def refreshAccessToken(self):  # noqa: D102
-        session = self._session
-
         # Create URL
         url = self.base_url + "token"
         json = {"refresh_token": self.refresh_token}
 
-        self.Debug_Message("refreshAccessToken", "URL: " + url)
-
         try:
             myheaders = {
                 **self.headers,
@@ -175,34 +785,23 @@ class LycheeThingsApiClient:
                 "Accept": "*/*",
             }
 
-            response = await session.post(url, headers=myheaders, json=json)
-
-            if (response.status < 200) or (response.status >= 300):
-                self.Debug_Message(
-                    "refreshAccessToken",
-                    "Error - response.status = " + str(response.status),
-                )
-                self.Debug_Message(
-                    "refreshAccessToken", "Error - response.text= " + await response.text()
-                )
-                raise LycheeThingsApiClientCommunicationError(
-                    f"Token refresh failed: {response.status}"
-                )
-
-            else:
-                # self.Debug_Message(
-                #     "refreshAccessToken",
-                #     "Success - response.ContentString = " + await response.text(),
-                # )
-
-                jsonResponse = await response.json()
-                self.access_token = jsonResponse["access_token"]
+            # 400 means the refresh token expired or was revoked
+            jsonResponse = await self._api_wrapper(
+                "refreshAccessToken",
+                "post",
+                url,
+                myheaders,
+                json,
+                log_body=False,
+                auth_statuses=(400, 401, 403),
+            )
 
-                # self.Debug_Message(
-                #     "refreshAccessToken", "Access Token = " + self.access_token
-                # )
+            self._tokens.set_tokens(
+                jsonResponse["access_token"],
+                expires_in=jsonResponse.get("expires_in"),
+            )
 
-                return True
+            return True
 
         except LycheeThingsApiClientError:
             raise
@@ -214,6 +813,47 @@ class LycheeThingsApiClient:
             )
             raise LycheeThingsApiClientError(str(ex)) from ex
 
+    ##****************************************************************************************
+    #
+    #       _authorized_request	-	Send a request with a valid access token
+    #
+    ##****************************************************************************************
+
+    async def _authorized_request(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        json: dict | None = None,
+        priority: int = PRIORITY_COMMAND,
+        key: Hashable | None = None,
+    ) -> Any:
+        """Send a request, refreshing the access token only when required.
+
+        A rejected token is invalidated and the request is retried once
+        with a new one.
+        """
+        access_token = await self._tokens.async_get_access_token()
+        myheaders = {
+            **self.headers,
+            "Content-Type": "application/json",
+            "Authorization": access_token,
+            "Accept": "*/*",
+        }
+
+        try:
+            return await self._api_wrapper(
+                name, method, url, myheaders, json, priority=priority, key=key
+            )
+        except LycheeThingsApiClientAuthenticationError:
+            self.Debug_Message(name, "Access token rejected, refreshing")
+            self._tokens.invalidate(access_token)
+
+        myheaders["Authorization"] = await self._tokens.async_get_access_token()
+        return await self._api_wrapper(
+            name, method, url, myheaders, json, priority=priority, key=key
+        )
+
     # ****************************************************************************************
     #
     #  getDeviceList	-	Gets the list of devices associated with an account
@@ -222,62 +862,32 @@ class LycheeThingsApiClient:
     # ****************************************************************************************
 
     async def getDeviceList(self):  # noqa: D102
-        session = self._session
-
-        await self.refreshAccessToken()
+        return await self._single_flight("devices", self._getDeviceList)
 
+    async def _getDeviceList(self):
+        """Download and decode the device list."""
         # Create URL
         url = self.base_url + "devices"
-        self.Debug_Message("GetDevicesList", "URL: " + url)
 
         try:
-            myheaders = {
-                **self.headers,
-                "Content-Type": "application/json",
-                "Authorization": self.access_token,
-                "Accept": "*/*",
-            }
-
-            response = await session.get(url, headers=myheaders)
-
-            if (response.status < 200) or (response.status >= 300):
-                self.Debug_Message(
-                    "getDeviceList",
-                    "Error - response.status = " + str(response.status),
-                )
-                self.Debug_Message(
-                    "getDeviceList", "Error - response.text= " + await response.text()
-                )
-                raise LycheeThingsApiClientCommunicationError(
-                    f"getDeviceList failed: {response.status}"
-                )
-
-            else:
-                self.Debug_Message(
-                    "getDeviceList",
-                    "Success - response.ContentString = " + await response.text(),
-                )
-
-                jsonResponse = await response.json()
-
-                Rooms = jsonResponse["room_lists"]
-
-                Devices = {}
+            # Polls go last and a newer poll replaces one still waiting
+            jsonResponse = await self._authorized_request(
+                "getDeviceList", "get", url, priority=PRIORITY_POLL, key=(self, url)
+            )
 
-                for Room in Rooms:
-                    deviceList = Room["device_list"]
-                    for device in deviceList:
-                        slydrDevice = SmartSlydrDevice.Schema().load(device)
-                        Devices[slydrDevice.device_id] = slydrDevice
-                    # Devices.append(SmartSlydrDevice.Schema().load(device))
+            Rooms = jsonResponse["room_lists"]
 
-                # self.access_token = jsonResponse["access_token"]
+            Devices = {}
 
-                # self.Debug_Message(
-                #     "refreshAccessToken", "Access Token = " + self.access_token
-                # )
+            start = time.perf_counter()
+            for Room in Rooms:
+                deviceList = Room["device_list"]
+                for device in deviceList:
+                    slydrDevice = SmartSlydrDevice.from_dict(device)
+                    Devices[slydrDevice.device_id] = slydrDevice
+            self.stats["devices"].parse_time += time.perf_counter() - start
 
-                return Devices
+            return Devices
 
         except LycheeThingsApiClientError:
             raise
@@ -296,55 +906,39 @@ class LycheeThingsApiClient:
     # ****************************************************************************************
 
     async def setPosition(self, device_id: str, position: int) -> None:  # noqa: D102
-        if (position > 100) and (position != 200):
-            self.Debug_Message(
-                "setPosition", "Error - Position out of range: " + str(position)
-            )
-            return
-
-        session = self._session
-        await self.refreshAccessToken()
-
-        # Create URL
-        url = self.base_url + "operation"
-        self.Debug_Message("setPosition", "URL: " + url)
-        json = {"setcommands":[{"device_id": device_id ,"commands":[{"key":"position","value": str(position)}]}]}
-
-        self.Debug_Message("setPosition", "for device " + str(json))
-
-        try:
-            myheaders = {
-                **self.headers,
-                "Content-Type": "application/json",
-                "Authorization": self.access_token,
-                "Accept": "*/*",
-            }
+        await self.setPositions({device_id: position})
 
-            response = await session.post(url, headers=myheaders, json=json)
+    # ****************************************************************************************
+    #
+    # 		setPositions	-	Set the position of several doors with a single request
+    #
+    # ****************************************************************************************
 
-            if (response.status < 200) or (response.status >= 300):
-                # server threw a error
-                self.Debug_Message(
-                    "setPosition",
-                    "Error - response.status = " + str(response.status),
-                )
+    async def setPositions(self, positions: dict[str, int]) -> None:  # noqa: D102
+        setcommands = []
+        for device_id, position in positions.items():
+            if (position > 100) and (position != 200):
                 self.Debug_Message(
-                    "setPosition", "Error - response.text= " + await response.text()
+                    "setPosition", "Error - Position out of range: " + str(position)
                 )
+                continue
+            setcommands.append(
+                {"device_id": device_id ,"commands":[{"key":"position","value": str(position)}]}
+            )
 
-            else:
-                self.Debug_Message(
-                    "setPosition",
-                    "Success - response.ContentString = " + await response.text(),
-                )
+        if not setcommands:
+            return
 
-        except Exception as ex:
-            LOGGER.error(
-                f"{DOMAIN} Exception in setPosition : %s - traceback: %s",  # noqa: G004
-                ex,
-                traceback.format_exc(),
-            )
+        # Create URL
+        url = self.base_url + "operation"
+        json = {"setcommands": setcommands}
 
+        if self.debug:
+            self.Debug_Message("setPosition", "for devices " + str(json))
+
+        # Reads sent before the command may miss it, later reads start anew
+        self._in_flight.clear()
+        await self._authorized_request("setPosition", "post", url, json)
 
     # ****************************************************************************************
     #
@@ -353,98 +947,78 @@ class LycheeThingsApiClient:
     # ****************************************************************************************
 
     async def getCurrentPosition(self, device_id: str):  # noqa: D102
-        session = self._session
-        await self.refreshAccessToken()
+        positions = await self.getCurrentPositions([device_id])
+        return positions.get(device_id)
+
+    # ****************************************************************************************
+    #
+    # 		getCurrentPositions	-	Get current door positions of several devices with a single
+    #                               request, returns dict device_id -> int 0 to 100
+    #
+    # ****************************************************************************************
 
+    async def getCurrentPositions(self, device_ids: Iterable[str]) -> dict[str, int]:  # noqa: D102
+        device_ids = list(device_ids)
+        if not device_ids:
+            return {}
+
+        # A device list download already sent answers the question as well;
+        # one still queued behind polls would delay the read
+        if (self, self.base_url + "devices") in self._sent and (
+            devices_task := self._in_flight.get("devices")
+        ) is not None:
+            with contextlib.suppress(LycheeThingsApiClientError):
+                devices = await asyncio.shield(devices_task)
+                if all(device_id in devices for device_id in device_ids):
+                    return {
+                        device_id: devices[device_id].position
+                        for device_id in device_ids
+                    }
+
+        return await self._single_flight(
+            ("positions", frozenset(device_ids)),
+            lambda: self._getCurrentPositions(device_ids),
+        )
+
+    async def _getCurrentPositions(self, device_ids: list[str]) -> dict[str, int]:
+        """Read the positions of `device_ids` with one request."""
         # Create URL
         url = self.base_url + "operation/get"
-        self.Debug_Message("getCurrentPosition", "URL: " + url)
-        json = {"commands":[{"device_id": device_id ,"command": "position"}]}
-
-        try:
-            myheaders = {
-                **self.headers,
-                "Content-Type": "application/json",
-                "Authorization": self.access_token,
-                "Accept": "*/*",
-            }
-
-            response = await session.post(url, headers=myheaders, json=json)
+        json = {"commands":[{"device_id": device_id ,"command": "position"} for device_id in device_ids]}
 
-            if (response.status < 200) or (response.status >= 300):
-                # server threw a error
-                self.Debug_Message(
-                    "getCurrentPosition",
-                    "Error - response.status = " + str(response.status),
-                )
-                self.Debug_Message(
-                    "getCurrentPosition", "Error - response.text= " + await response.text()
-                )
+        current_position = await self._authorized_request(
+            "getCurrentPosition",
+            "post",
+            url,
+            json,
+            priority=PRIORITY_VERIFY,
+            key=(self, url, frozenset(device_ids)),
+        )
 
-            else:
-                self.Debug_Message(
-                    "getCurrentPosition",
-                    "Success - response.ContentString = " + await response.text(),
+        try:
+            # Answers carry the device_id if available, otherwise they
+            # come back in the order they were requested
+            answers = current_position["response"]
+            if len(answers) != len(device_ids) and not all(
+                "device_id" in answer for answer in answers
+            ):
+                # With a device left out, the order no longer tells which
+                # answer belongs to which device
+                raise LycheeThingsApiClientError(
+                    f"getCurrentPosition: {len(answers)} answers without device_id"
+                    f" for {len(device_ids)} devices"
                 )
+            positions = {}
+            for device_id, answer in zip(device_ids, answers):
+                positions[answer.get("device_id", device_id)] = int(answer["position"])
+            return positions
 
-                current_position = await response.json()
-
-                return current_position["response"][0]["position"]
-
+        except LycheeThingsApiClientError:
+            raise
         except Exception as ex:
             LOGGER.error(
                 f"{DOMAIN} Exception in getCurrentPosition : %s - traceback: %s",  # noqa: G004
                 ex,
                 traceback.format_exc(),
             )
-
-    # async def async_get_data(self) -> any:
-    #     """Get data from the API."""
-    #     return await self._api_wrapper(
-    #         method="get", url="https://jsonplaceholder.typicode.com/posts/1"
-    #     )
-
-    # async def async_set_title(self, value: str) -> any:
-    #     """Get data from the API."""
-    #     return await self._api_wrapper(
-    #         method="patch",
-    #         url="https://jsonplaceholder.typicode.com/posts/1",
-    #         data={"title": value},
-    #         headers={"Content-type": "application/json; charset=UTF-8"},
-    #     )
-
-    # async def _api_wrapper(
-    #     self,
-    #     method: str,
-    #     url: str,
-    #     data: dict | None = None,
-    #     headers: dict | None = None,
-    # ) -> any:
-    #     """Get information from the API."""
-    #     try:
-    #         async with async_timeout.timeout(10):
-    #             response = await self._session.request(
-    #                 method=method,
-    #                 url=url,
-    #                 headers=headers,
-    #                 json=data,
-    #             )
-    #             if response.status in (401, 403):
-    #                 raise LycheeThingsApiClientAuthenticationError(
-    #                     "Invalid credentials",
-    #                 )
-    #             response.raise_for_status()
-    #             return await response.json()
-
-    #     except asyncio.TimeoutError as exception:
-    #         raise LycheeThingsApiClientCommunicationError(
-    #             "Timeout error fetching information",
-    #         ) from exception
-    #     except (aiohttp.ClientError, socket.gaierror) as exception:
-    #         raise LycheeThingsApiClientCommunicationError(
-    #             "Error fetching information",
-    #         ) from exception
-    #     except Exception as exception:  # pylint: disable=broad-except
-    #         raise LycheeThingsApiClientError(
-    #             "Something really wrong happened!"
-    #         ) from exception
+            raise LycheeThingsApiClientError(str(ex)) from ex
@@ -0,0 +1,116 @@
+"""Binary sensor platform for SmartSlydr."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.const import EntityCategory
+
+from .api import SmartSlydrDevice
+from .const import DOMAIN
+from .coordinator import SmartSlydrCloudUpdateCoordinator
+from .entity import SmartSlydrDeviceStateEntity, async_setup_device_entities
+
+
+@dataclass
+class SmartSlydrBinarySensorEntityDescriptionMixin:
+    """Required keys of a SmartSlydr binary sensor."""
+
+    is_on_fn: Callable[[SmartSlydrDevice], bool | None]
+
+
+@dataclass
+class SmartSlydrBinarySensorEntityDescription(
+    BinarySensorEntityDescription, SmartSlydrBinarySensorEntityDescriptionMixin
+):
+    """Describes a SmartSlydr binary sensor."""
+
+    attributes_fn: Callable[[SmartSlydrDevice], dict[str, Any]] | None = None
+
+
+# Values of `petpass` with an unambiguous meaning; the cloud's encoding is
+# not documented, so anything else is reported as unknown
+PETPASS_STATES = {
+    "on": True,
+    "true": True,
+    "1": True,
+    "off": False,
+    "false": False,
+    "0": False,
+}
+
+
+BINARY_SENSORS: tuple[SmartSlydrBinarySensorEntityDescription, ...] = (
+    SmartSlydrBinarySensorEntityDescription(
+        key="petpass",
+        name="Pet pass",
+        icon="mdi:paw",
+        is_on_fn=lambda device: PETPASS_STATES.get(device.petpass.strip().lower()),
+    ),
+    SmartSlydrBinarySensorEntityDescription(
+        key="error",
+        name="Problem",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        is_on_fn=lambda device: bool(device.error),
+        attributes_fn=lambda device: {"error": device.error} if device.error else {},
+    ),
+)
+
+
+async def async_setup_entry(hass, entry, async_add_devices):
+    """Set up the binary sensor platform."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    async_setup_device_entities(
+        entry,
+        coordinator,
+        async_add_devices,
+        lambda device: [
+            SmartSlydrBinarySensor(coordinator, device, description)
+            for description in BINARY_SENSORS
+        ],
+    )
+
+
+class SmartSlydrBinarySensor(SmartSlydrDeviceStateEntity, BinarySensorEntity):
+    """Binary sensor reporting a flag from the device list."""
+
+    entity_description: SmartSlydrBinarySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: SmartSlydrCloudUpdateCoordinator,
+        device: SmartSlydrDevice,
+        description: SmartSlydrBinarySensorEntityDescription,
+    ) -> None:
+        """Initialize the binary sensor."""
+        self.entity_description = description
+        self._attr_is_on = None
+        self._attributes: dict[str, Any] = {}
+        super().__init__(coordinator, device, description.key)
+        self._attr_name = f"{device.devicename} {description.name}"
+
+    def _update_from_device(self, device: SmartSlydrDevice) -> bool:
+        """Take the flag from `device`; return True if it changed."""
+        is_on = self.entity_description.is_on_fn(device)
+        attributes = (
+            self.entity_description.attributes_fn(device)
+            if self.entity_description.attributes_fn is not None
+            else {}
+        )
+        if is_on == self._attr_is_on and attributes == self._attributes:
+            return False
+        self._attr_is_on = is_on
+        self._attributes = attributes
+        return True
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the attributes of the flag."""
+        return {**self._attributes, **(super().extra_state_attributes or {})} or None
@@ -5,29 +5,28 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.core import callback
 
 from .api import (
-    LycheeThingsApiClient,
     LycheeThingsApiClientAuthenticationError,
     LycheeThingsApiClientCommunicationError,
     LycheeThingsApiClientError,
 )
 from .const import DOMAIN, LOGGER
+from .session import async_acquire_client, async_release_client
 
 class SmartSlydrBaseFlowHandler(config_entries.ConfigFlow):  # noqa: D101
     async def _test_credentials(self, username: str, password: str) -> bool:
         """Validate credentials. Returns True if valid, False otherwise."""
-        client = LycheeThingsApiClient(
-            username,
-            password,
-            async_create_clientsession(self.hass),
-        )
-
-        if not await client.getSecurityTokens():
-            return False
-        return True
+        # A client of the shared session keeps it open and shares its
+        # request scheduler while the flow uses it
+        client = async_acquire_client(self.hass, username, password)
+        try:
+            if not await client.getSecurityTokens():
+                return False
+            return True
+        finally:
+            await async_release_client(self.hass, client)
 
     # Options Flow
     @staticmethod
@@ -15,6 +15,50 @@ CONF_PASSWORD = "password"
 
 CONF_SYNC_INTERVAL = "sync_interval"
 
+# `status` of a SmartSlydrDevice that can be controlled
+DEVICE_ONLINE = "device is online"
+
+# State attribute of entities showing cached data after a restart
+ATTR_STALE = "stale"
+
 DEFAULT_SYNC_INTERVAL = 60  # seconds
+# Polls of several entries are spread over the interval and shifted by up
+# to this much at random
+POLL_JITTER = 2  # seconds
+# Spacing of position reads of a moving cover whose arrival cannot be
+# predicted, and the time a position must stay unchanged to count as stopped
+VERIFY_INTERVAL = 5  # seconds
+# Upper bound for the poll interval while the cloud keeps failing
+MAX_SYNC_BACKOFF = 600  # seconds
+# Remove a device once it was missing from this many polls in a row
+DEVICE_REMOVAL_POLLS = 2
+# Stop tracking the motion of a cover after this long
+MOTION_TIMEOUT = 120  # seconds
+# Assumed speed of a cover until its real travel speed has been observed
+DEFAULT_TRAVEL_SPEED = 5  # percent per second
+# Added to the predicted travel time before verifying the final position
+MOTION_CHECK_GRACE = 1  # seconds
+# Refresh the interpolated position of a moving cover this often
+INTERPOLATION_INTERVAL = 1  # seconds
+
+# Position commands are sent once no new command arrived for this long;
+# later commands for the same device replace unsent ones
+COMMAND_BATCH_WINDOW = 0.3  # seconds
+# Send queued commands at the latest this long after the first one
+COMMAND_MAX_DELAY = 1  # seconds
+# Reasons for not sending a position command to a device
+COMMAND_SKIPPED_OFFLINE = "offline"
+COMMAND_SKIPPED_UNCHANGED = "unchanged"
+
+# HTTP session shared by all entries, connections to the cloud are reused
+SESSION_CONNECTION_LIMIT = 10
+SESSION_DNS_CACHE_TTL = 300  # seconds
+SESSION_KEEPALIVE_TIMEOUT = 60  # seconds
+# Requests to the cloud in flight at once, across all entries
+MAX_CONCURRENT_REQUESTS = 4
+
+# Tokens and the last device list are cached in HA storage
+STORAGE_VERSION = 1
+CACHE_SAVE_DELAY = 30  # seconds
 
 LOGGER: Logger = getLogger(__package__)
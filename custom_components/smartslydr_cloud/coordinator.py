@@ -1,10 +1,18 @@
 """DataUpdateCoordinator for smartslydr_cloud."""
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import random
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
 from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
@@ -14,14 +22,149 @@ from homeassistant.exceptions import ConfigEntryAuthFailed
 from .api import (
     LycheeThingsApiClient,
     LycheeThingsApiClientAuthenticationError,
+    LycheeThingsApiClientCircuitOpenError,
     LycheeThingsApiClientError,
+    LycheeThingsTimingStats,
+    SmartSlydrDevice,
 )
-from .const import DOMAIN, LOGGER
+from .const import (
+    CACHE_SAVE_DELAY,
+    COMMAND_SKIPPED_OFFLINE,
+    COMMAND_SKIPPED_UNCHANGED,
+    DEFAULT_TRAVEL_SPEED,
+    DEVICE_ONLINE,
+    DEVICE_REMOVAL_POLLS,
+    DOMAIN,
+    LOGGER,
+    MAX_SYNC_BACKOFF,
+    MOTION_CHECK_GRACE,
+    MOTION_TIMEOUT,
+    POLL_JITTER,
+    VERIFY_INTERVAL,
+)
+
+DATA_POLL_SCHEDULER = f"{DOMAIN}_poll_scheduler"
+
+
+def device_identifier(device_id: str) -> tuple[str, str]:
+    """Return the device registry identifier of a SmartSlydr device."""
+    return (DOMAIN, f"{device_id}_cover")
+
+
+@dataclass
+class _Motion:
+    """A device the coordinator believes to be moving.
+
+    The position is extrapolated from the last observation (`start_position`
+    at `start_time`) with the learned `speed` in percent per second.
+    """
+
+    target: int | None
+    start_position: int | None
+    start_time: float
+    speed: float
+    deadline: float
+    check_at: float
+    command_position: int | None
+    command_time: float
+    observed: bool = False
+
+    def estimate(self, now: float) -> int | None:
+        """Return the extrapolated position, if it can be predicted."""
+        if self.target is None or self.start_position is None:
+            return None
+        travelled = self.speed * (now - self.start_time)
+        if self.target >= self.start_position:
+            return round(min(self.start_position + travelled, self.target))
+        return round(max(self.start_position - travelled, self.target))
+
+    def eta(self) -> float:
+        """Return when the device is expected to reach its target."""
+        if self.target is None or self.start_position is None:
+            return self.start_time + VERIFY_INTERVAL
+        return (
+            self.start_time
+            + abs(self.target - self.start_position) / self.speed
+            + MOTION_CHECK_GRACE
+        )
+
+    @property
+    def direction(self) -> int:
+        """Return 1 when opening, -1 when closing."""
+        if self.target is not None and self.start_position is not None:
+            reference, destination = self.start_position, self.target
+        else:
+            reference, destination = self.command_position, self.start_position
+        if reference is None or destination is None or reference == destination:
+            return 0
+        return 1 if destination > reference else -1
+
+
+class SmartSlydrPollScheduler:
+    """Spread the polls of all coordinators evenly over their interval.
+
+    Each coordinator gets an equal share of the interval as its phase and
+    polls when the clock reaches it, shifted by up to POLL_JITTER. Entries
+    set up together therefore do not poll in lock-step.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self._coordinators: list[SmartSlydrCloudUpdateCoordinator] = []
+
+    def register(self, coordinator: SmartSlydrCloudUpdateCoordinator) -> None:
+        """Start scheduling the polls of `coordinator`."""
+        if coordinator not in self._coordinators:
+            self._coordinators.append(coordinator)
+
+    def unregister(self, coordinator: SmartSlydrCloudUpdateCoordinator) -> None:
+        """Stop scheduling the polls of `coordinator`."""
+        if coordinator in self._coordinators:
+            self._coordinators.remove(coordinator)
+
+    def next_interval(
+        self, coordinator: SmartSlydrCloudUpdateCoordinator, interval: timedelta
+    ) -> timedelta:
+        """Return the delay until the next poll of `coordinator`.
+
+        The delay is between half and one and a half `interval`, so the poll
+        lands on the phase of the coordinator.
+        """
+        if coordinator not in self._coordinators:
+            return interval
+
+        seconds = interval.total_seconds()
+        phase = (
+            self._coordinators.index(coordinator) / len(self._coordinators) * seconds
+        )
+        delay = (phase - time.time()) % seconds
+        if delay < seconds / 2:
+            delay += seconds
+        jitter = min(POLL_JITTER, seconds / 10)
+        return timedelta(seconds=delay + random.uniform(-jitter, jitter))
+
+
+@callback
+def _async_get_poll_scheduler(hass: HomeAssistant) -> SmartSlydrPollScheduler:
+    """Return the poll scheduler shared by all entries."""
+    if (scheduler := hass.data.get(DATA_POLL_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_POLL_SCHEDULER] = SmartSlydrPollScheduler()
+    return scheduler
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
 class SmartSlydrCloudUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+    """Class to manage fetching data from the API.
+
+    Moving covers are followed with a motion model that learns the travel
+    speed of each device; its position is read once, when it is expected to
+    have arrived. The full device list is fetched at the configured interval,
+    staggered with the other entries by SmartSlydrPollScheduler and backing
+    off while the cloud is failing.
+
+    Tokens, the last device list and the learned speeds are kept in `store`,
+    so entities can be set up from the cache after a restart.
+    """
 
     config_entry: ConfigEntry
 
@@ -30,9 +173,36 @@ class SmartSlydrCloudUpdateCoordinator(DataUpdateCoordinator):
         hass: HomeAssistant,
         client: LycheeThingsApiClient,
         update_interval: int,
+        store: Store | None = None,
     ) -> None:
         """Initialize."""
         self.client = client
+        self._store = store
+        self._idle_interval = timedelta(seconds=update_interval)
+        self._moving: dict[str, _Motion] = {}
+        self._positions: dict[str, int] = {}
+        self._speeds: dict[str, float] = {}
+        self._motion_task: asyncio.Task | None = None
+        self._motion_changed = asyncio.Event()
+        # Devices changed by the last update; None notifies every listener
+        self._changed: set[str] | None = None
+        self._notified_success = True
+        self._registry_synced = False
+        # Successful polls in a row missing a device, by device registry id
+        self._missing: dict[str, int] = {}
+        # Data restored from the cache and not confirmed by a poll yet
+        self._stale = False
+        # Tokens and travel speeds in the last cache saved
+        self._saved_tokens: tuple[str, str] | None = None
+        self._saved_speeds: dict[str, float] = {}
+        # Duration of device list polls, including decoding and diffing
+        self.poll_stats = LycheeThingsTimingStats()
+        # Position commands not sent to the cloud, by reason
+        self.skipped_commands = dict.fromkeys(
+            (COMMAND_SKIPPED_OFFLINE, COMMAND_SKIPPED_UNCHANGED), 0
+        )
+        self._poll_scheduler = _async_get_poll_scheduler(hass)
+        self._poll_scheduler.register(self)
         super().__init__(
             hass=hass,
             logger=LOGGER,
@@ -42,9 +212,465 @@ class SmartSlydrCloudUpdateCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self):
         """Update data via library."""
+        start = time.perf_counter()
         try:
-            return await self.client.getDeviceList()
+            devices = await self.client.getDeviceList()
         except LycheeThingsApiClientAuthenticationError as exception:
+            self.poll_stats.record(time.perf_counter() - start, error=True)
             raise ConfigEntryAuthFailed(exception) from exception
         except LycheeThingsApiClientError as exception:
+            self.poll_stats.record(time.perf_counter() - start, error=True)
+            self.update_interval = min(
+                self.update_interval * 2,
+                timedelta(seconds=MAX_SYNC_BACKOFF),
+            )
+            if isinstance(exception, LycheeThingsApiClientCircuitOpenError):
+                # No point in polling before the cloud is probed again
+                self.update_interval = max(
+                    self.update_interval, timedelta(seconds=exception.retry_in)
+                )
             raise UpdateFailed(exception) from exception
+
+        self._changed = {
+            device_id
+            for device_id, device in devices.items()
+            if not self.data or self.data.get(device_id) != device
+        }
+        if self._stale:
+            # Every entity drops its stale mark
+            self._stale = False
+            self._changed.update(devices)
+        devices_changed = bool(self._changed) or (
+            self.data is None or devices.keys() != self.data.keys()
+        )
+        self.update_interval = self._poll_scheduler.next_interval(
+            self, self._idle_interval
+        )
+        for device_id in self._moving.keys() - devices.keys():
+            del self._moving[device_id]
+        # An empty list is more likely a glitch of the cloud than an account
+        # without devices
+        if self.config_entry is not None and devices and (
+            not self._registry_synced
+            or self._missing
+            or self.data is None
+            or devices.keys() != self.data.keys()
+        ):
+            self._async_remove_stale_devices(devices)
+        self._changed |= self._async_track_positions(
+            {device_id: device.position for device_id, device in devices.items()}
+        )
+        self._async_schedule_save(devices_changed)
+        self.poll_stats.record(time.perf_counter() - start)
+        return devices
+
+    @callback
+    def _async_remove_stale_devices(self, devices: dict[str, SmartSlydrDevice]) -> None:
+        """Remove devices that left the account, and their entities.
+
+        A device is only removed once it was missing from DEVICE_REMOVAL_POLLS
+        polls in a row, so a partial answer of the cloud keeps entity ids,
+        names and areas. Entities of new devices are added by the platforms
+        when they are notified of the update.
+        """
+        self._registry_synced = True
+        wanted = {device_identifier(device_id) for device_id in devices}
+        registry = dr.async_get(self.hass)
+        missing = {}
+        for device_entry in dr.async_entries_for_config_entry(
+            registry, self.config_entry.entry_id
+        ):
+            if not device_entry.identifiers.isdisjoint(wanted):
+                continue
+            polls = self._missing.get(device_entry.id, 0) + 1
+            if polls < DEVICE_REMOVAL_POLLS:
+                missing[device_entry.id] = polls
+                continue
+            LOGGER.info(
+                "%s - removing %s, it is no longer part of the account",
+                DOMAIN,
+                ", ".join(sorted(value for _, value in device_entry.identifiers)),
+            )
+            registry.async_update_device(
+                device_entry.id, remove_config_entry_id=self.config_entry.entry_id
+            )
+        self._missing = missing
+
+    def is_device_missing(self, device_id: str) -> bool:
+        """Return True if `device_id` left the account but was not removed yet."""
+        device_entry = dr.async_get(self.hass).async_get_device(
+            {device_identifier(device_id)}
+        )
+        return device_entry is not None and device_entry.id in self._missing
+
+    async def async_restore_cache(self) -> bool:
+        """Restore tokens and the last device list from the store.
+
+        Returns True if devices were restored and entities can be set up
+        without waiting for the cloud.
+        """
+        if self._store is None or not (cache := await self._store.async_load()):
+            return False
+
+        # Tokens of another account are useless after the credentials changed
+        if (tokens := cache.get("tokens")) and cache.get(
+            "username"
+        ) == self.client.username:
+            self.client.restore_tokens(tokens)
+        self._speeds.update(cache.get("speeds", {}))
+
+        try:
+            devices = {
+                device.device_id: device
+                for device in map(SmartSlydrDevice.from_dict, cache.get("devices", []))
+            }
+        except ValueError as exception:
+            LOGGER.debug("%s - ignoring cached devices: %s", DOMAIN, exception)
+            return False
+        if not devices:
+            return False
+
+        self.data = devices
+        self._stale = True
+        self._async_track_positions(
+            {device_id: device.position for device_id, device in devices.items()}
+        )
+        return True
+
+    @callback
+    def _async_schedule_save(self, devices_changed: bool) -> None:
+        """Save the cache if the devices, tokens or travel speeds changed.
+
+        Polls without news do not rewrite the storage file.
+        """
+        if self._store is None:
+            return
+        tokens = (self.client.access_token, self.client.refresh_token)
+        if (
+            not devices_changed
+            and tokens == self._saved_tokens
+            and self._speeds == self._saved_speeds
+        ):
+            return
+        self._saved_tokens = tokens
+        self._saved_speeds = dict(self._speeds)
+        self._store.async_delay_save(self._cache_data, CACHE_SAVE_DELAY)
+
+    async def async_save_cache(self) -> None:
+        """Write the cache now instead of after the save delay."""
+        if self._store is not None and self.data is not None:
+            await self._store.async_save(self._cache_data())
+
+    @callback
+    def _cache_data(self) -> dict:
+        """Return the data kept in the store."""
+        return {
+            "username": self.client.username,
+            "tokens": self.client.export_tokens(),
+            "devices": [asdict(device) for device in (self.data or {}).values()],
+            "speeds": self._speeds,
+        }
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the entities whose device changed since the last update.
+
+        Listeners without a context, and all listeners when the availability
+        of the coordinator changed, are always notified.
+        """
+        changed, self._changed = self._changed, None
+        if changed is None or self.last_update_success != self._notified_success:
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
+    @callback
+    def async_notify_devices(self, device_ids: Iterable[str]) -> None:
+        """Notify the entities of `device_ids`, e.g. after they were moved."""
+        self._changed = set(device_ids)
+        self.async_update_listeners()
+
+    @property
+    def is_stale(self) -> bool:
+        """Return True while the data comes from the cache, not from a poll."""
+        return self._stale
+
+    @property
+    def data_available(self) -> bool:
+        """Return True if the data can be shown.
+
+        Cached data stays available until the first poll after a restart
+        succeeded, even if that takes a few attempts.
+        """
+        return self.last_update_success or self._stale
+
+    @property
+    def travel_speeds(self) -> dict[str, float]:
+        """Return the learned travel speeds in percent per second."""
+        return dict(self._speeds)
+
+    @property
+    def is_moving(self) -> bool:
+        """Return True if any device is believed to be moving."""
+        return bool(self._moving)
+
+    def is_device_moving(self, device_id: str) -> bool:
+        """Return True if `device_id` is believed to be moving."""
+        return device_id in self._moving
+
+    def is_device_online(self, device_id: str) -> bool:
+        """Return True if the cloud reports `device_id` as online."""
+        device = (self.data or {}).get(device_id)
+        return device is not None and device.status == DEVICE_ONLINE
+
+    def is_at_position(self, device_id: str, position: int) -> bool:
+        """Return True if `device_id` is known to rest at `position`."""
+        device = (self.data or {}).get(device_id)
+        return (
+            device is not None
+            and device.position == position
+            and not self.is_device_moving(device_id)
+        )
+
+    def filter_commands(
+        self, positions: dict[str, int]
+    ) -> tuple[dict[str, int], dict[str, str]]:
+        """Split position commands into those worth sending and skipped ones.
+
+        Commands for offline devices and for devices resting at the target
+        are skipped; they are returned with the reason and counted in
+        `skipped_commands`.
+        """
+        send: dict[str, int] = {}
+        skipped: dict[str, str] = {}
+        for device_id, position in positions.items():
+            if not self.is_device_online(device_id):
+                skipped[device_id] = COMMAND_SKIPPED_OFFLINE
+            elif self.is_at_position(device_id, position):
+                skipped[device_id] = COMMAND_SKIPPED_UNCHANGED
+            else:
+                send[device_id] = position
+        for reason in skipped.values():
+            self.skipped_commands[reason] += 1
+        return send, skipped
+
+    def estimated_position(self, device_id: str) -> int | None:
+        """Return the predicted position of a moving device, else None."""
+        if (motion := self._moving.get(device_id)) is None:
+            return None
+        return motion.estimate(time.monotonic())
+
+    def motion_direction(self, device_id: str) -> int:
+        """Return 1 if the device is opening, -1 if closing, else 0."""
+        if (motion := self._moving.get(device_id)) is None:
+            return 0
+        return motion.direction
+
+    @callback
+    def async_track_motion(self, device_id: str, target: int | None = None) -> None:
+        """Follow `device_id` until it reached `target` or stopped moving."""
+        now = time.monotonic()
+        position = self._positions.get(device_id)
+        motion = self._moving[device_id] = _Motion(
+            target=target,
+            start_position=position,
+            start_time=now,
+            speed=self._speeds.get(device_id, DEFAULT_TRAVEL_SPEED),
+            deadline=now + MOTION_TIMEOUT,
+            check_at=now,
+            command_position=position,
+            command_time=now,
+        )
+        motion.check_at = motion.eta()
+        if device_id not in self._speeds:
+            # Observe the first movement early to learn the travel speed
+            motion.check_at = min(motion.check_at, now + VERIFY_INTERVAL)
+        self._async_follow_motion()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following moving devices and scheduling polls."""
+        self._poll_scheduler.unregister(self)
+        self._moving.clear()
+        if self._motion_task is not None:
+            self._motion_task.cancel()
+            self._motion_task = None
+
+    @callback
+    def _async_track_positions(self, positions: dict[str, int]) -> set[str]:
+        """Update the motion model of devices from freshly read positions.
+
+        Returns the devices that started or stopped moving.
+        """
+        now = time.monotonic()
+        changed = set()
+
+        for device_id, position in positions.items():
+            previous = self._positions.get(device_id)
+            self._positions[device_id] = position
+
+            if (motion := self._moving.get(device_id)) is None:
+                # Moved by someone else, e.g. the LycheeThings app
+                if previous is not None and previous != position:
+                    self._moving[device_id] = _Motion(
+                        target=None,
+                        start_position=position,
+                        start_time=now,
+                        speed=self._speeds.get(device_id, DEFAULT_TRAVEL_SPEED),
+                        deadline=now + MOTION_TIMEOUT,
+                        check_at=now + VERIFY_INTERVAL,
+                        command_position=previous,
+                        command_time=now,
+                    )
+                    changed.add(device_id)
+                continue
+
+            if self._async_observe(device_id, motion, position, previous, now):
+                del self._moving[device_id]
+                changed.add(device_id)
+
+        for device_id in [
+            device_id
+            for device_id, motion in self._moving.items()
+            if now > motion.deadline
+        ]:
+            del self._moving[device_id]
+            changed.add(device_id)
+
+        self._async_follow_motion()
+        return changed
+
+    @callback
+    def _async_observe(
+        self,
+        device_id: str,
+        motion: _Motion,
+        position: int,
+        previous: int | None,
+        now: float,
+    ) -> bool:
+        """Feed an observed position into `motion`; return True when it ended."""
+        if motion.target is None:
+            # Not commanded by us: follow until the position is stable
+            if position != previous:
+                motion.start_position, motion.start_time = position, now
+            elif now - motion.start_time >= VERIFY_INTERVAL:
+                return True
+            motion.check_at = motion.start_time + VERIFY_INTERVAL
+            return False
+
+        if position == motion.target:
+            if not motion.observed and motion.command_position not in (
+                None,
+                motion.target,
+            ):
+                # Arrived by the first check: the door is at least as fast as
+                # this, and may be faster, so try a shorter wait next time.
+                distance = abs(motion.target - motion.command_position)
+                self._speeds[device_id] = max(
+                    motion.speed * 1.1, distance / max(now - motion.command_time, 1)
+                )
+            return True
+
+        if motion.command_position is None:
+            # Position unknown when the command was sent, start from here
+            motion.command_position = motion.start_position = position
+            motion.command_time = motion.start_time = now
+            motion.check_at = motion.eta()
+            return False
+
+        if position == motion.command_position:
+            # Not started yet; a poll before the planned check keeps it
+            motion.check_at = max(motion.check_at, now + VERIFY_INTERVAL)
+            return False
+
+        if motion.observed and position == previous:
+            # A read right after the last one, e.g. a poll just after a
+            # check, may repeat the position of a door still travelling
+            return now - motion.start_time >= VERIFY_INTERVAL
+
+        # Still travelling: learn the speed and predict the rest of the way
+        if (elapsed := now - motion.command_time) > 0:
+            sample = abs(position - motion.command_position) / elapsed
+            motion.speed = self._speeds[device_id] = (
+                self._speeds.get(device_id, sample) + sample
+            ) / 2
+        motion.start_position, motion.start_time = position, now
+        motion.observed = True
+        motion.check_at = motion.eta()
+        return False
+
+    @callback
+    def _async_follow_motion(self) -> None:
+        """Start verifying positions if a device is moving."""
+        if not self._moving:
+            return
+        if self._motion_task is None or self._motion_task.done():
+            self._motion_task = self.hass.async_create_background_task(
+                self._async_verify_motion(), f"{DOMAIN} verify positions"
+            )
+        else:
+            self._motion_changed.set()
+
+    async def _async_verify_motion(self) -> None:
+        """Read the positions of moving devices when they should have arrived.
+
+        Devices due at the same time are read with a single `/operation/get`
+        request instead of a full refresh.
+        """
+        while self._moving:
+            now = time.monotonic()
+            delay = min(motion.check_at for motion in self._moving.values()) - now
+            if delay > 0:
+                self._motion_changed.clear()
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._motion_changed.wait(), delay)
+                continue
+
+            device_ids = []
+            for device_id, motion in self._moving.items():
+                if motion.check_at <= now:
+                    device_ids.append(device_id)
+                    # Checked again later unless the answer says otherwise
+                    motion.check_at = now + VERIFY_INTERVAL
+
+            try:
+                await self.async_refresh_positions(device_ids)
+            except LycheeThingsApiClientError as exception:
+                LOGGER.debug("%s - verifying positions failed: %s", DOMAIN, exception)
+                # Still give up on devices whose motion timed out
+                if changed := self._async_track_positions({}):
+                    self.async_notify_devices(changed)
+
+    async def async_refresh_positions(
+        self, device_ids: Iterable[str] | None = None
+    ) -> None:
+        """Refresh only the positions of `device_ids` (default: all devices).
+
+        Uses a single `/operation/get` request instead of downloading the
+        whole device list and updates `data` in place.
+        """
+        if not self.data:
+            return
+
+        device_ids = [
+            device_id
+            for device_id in (self.data if device_ids is None else device_ids)
+            if device_id in self.data
+        ]
+        positions = await self.client.getCurrentPositions(device_ids)
+
+        changed = set()
+        for device_id, position in positions.items():
+            device = self.data.get(device_id)
+            if device is not None and device.position != position:
+                device.position = position
+                changed.add(device_id)
+
+        changed |= self._async_track_positions(positions)
+        if changed:
+            self.async_notify_devices(changed)
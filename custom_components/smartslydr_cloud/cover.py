@@ -1,54 +1,296 @@
 """Cover platform for SmartSlydr."""
 from __future__ import annotations
 
+from abc import abstractmethod
+import asyncio
+from collections.abc import Iterable
 
 from homeassistant.components.cover import CoverEntity, CoverDeviceClass, CoverEntityFeature, ATTR_POSITION
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from typing import Any
 
-from .const import DOMAIN, LOGGER
+from .api import LycheeThingsApiClientError, SmartSlydrDevice
+from .const import (
+    ATTRIBUTION,
+    COMMAND_BATCH_WINDOW,
+    COMMAND_MAX_DELAY,
+    COMMAND_SKIPPED_OFFLINE,
+    DEVICE_ONLINE,
+    DOMAIN,
+    INTERPOLATION_INTERVAL,
+    LOGGER,
+)
 from .coordinator import SmartSlydrCloudUpdateCoordinator
-from .entity import SmartSlydrEntity
+from .entity import (
+    SmartSlydrEntity,
+    SmartSlydrStaleMixin,
+    async_setup_device_entities,
+)
 
 
 async def async_setup_entry(hass, entry, async_add_devices):
     """Set up the sensor platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
+    batcher = SmartSlydrCommandBatcher(hass, coordinator)
 
     LOGGER.debug(f"{DOMAIN} - {coordinator.data}")  # noqa: G004
-    async_add_devices(
-        SmartSlydrCover(
-            hass=hass,
-            coordinator=coordinator,
-            entry=entry,
-            device=coordinator.data[device],
-        )
-        for device in coordinator.data
+    async_setup_device_entities(
+        entry,
+        coordinator,
+        async_add_devices,
+        lambda device: [
+            SmartSlydrCover(
+                hass=hass,
+                coordinator=coordinator,
+                entry=entry,
+                device=device,
+                batcher=batcher,
+            )
+        ],
     )
 
+    groups: dict[str | None, SmartSlydrGroupCover] = {}
+
+    @callback
+    def _async_update_groups() -> None:
+        """Add and remove group covers as rooms and devices change."""
+        wanted = _group_keys(coordinator.data or {})
+        registry = er.async_get(hass)
+        for room_id in groups.keys() - wanted:
+            group = groups.pop(room_id)
+            if group.entity_id and registry.async_get(group.entity_id):
+                registry.async_remove(group.entity_id)
+            else:
+                hass.async_create_task(group.async_remove())
+
+        new_groups = [
+            SmartSlydrGroupCover(coordinator, entry, batcher, room_id)
+            for room_id in wanted - groups.keys()
+        ]
+        if new_groups:
+            groups.update((group.room_id, group) for group in new_groups)
+            async_add_devices(new_groups)
+
+    _async_update_groups()
+    entry.async_on_unload(coordinator.async_add_listener(_async_update_groups))
+
+
+def _group_keys(devices: dict[str, SmartSlydrDevice]) -> set[str | None]:
+    """Return the rooms that get a group cover, None for all devices.
+
+    Groups that would move the same devices as another cover are skipped.
+    """
+    rooms: dict[str, int] = {}
+    for device in devices.values():
+        rooms[device.room_id] = rooms.get(device.room_id, 0) + 1
+
+    keys: set[str | None] = {room_id for room_id, count in rooms.items() if count > 1}
+    if len(rooms) > 1:
+        keys.add(None)
+    return keys
+
+
+class SmartSlydrCommandBatcher:
+    """Debounce position commands and send them with a single request.
+
+    Commands are collected until none arrived for `window` seconds, but at
+    most `max_delay` seconds after the first one. A burst of commands for one
+    device (e.g. a dragged slider) is coalesced to its last target, and
+    commands for several devices (e.g. an automation closing every window)
+    share one `/operation` call. Commands that became pointless while they
+    waited, e.g. a slider dragged back to the current position, are dropped.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SmartSlydrCloudUpdateCoordinator,
+        window: float = COMMAND_BATCH_WINDOW,
+        max_delay: float = COMMAND_MAX_DELAY,
+    ) -> None:
+        """Initialize the batcher."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.window = window
+        self.max_delay = max_delay
+        self._pending: dict[str, int] = {}
+        self._batch: asyncio.Future | None = None
+        self._send_at = 0.0
+
+    @callback
+    def async_cancel(self, device_ids: Iterable[str]) -> None:
+        """Drop the unsent commands for `device_ids`."""
+        for device_id in device_ids:
+            self._pending.pop(device_id, None)
+
+    async def async_set_positions(self, positions: dict[str, int]) -> dict[str, int]:
+        """Queue commands for several devices to be sent in the same batch.
+
+        Returns the positions sent to those devices that were moved.
+        """
+        now = self.hass.loop.time()
+        if self._batch is None:
+            self._batch = self.hass.loop.create_future()
+            self._send_at = now + self.window
+            self.hass.async_create_task(self._async_send_batch(now + self.max_delay))
+        else:
+            self._send_at = now + self.window
+
+        self._pending.update(positions)
+        sent = await asyncio.shield(self._batch)
+        return {
+            device_id: sent[device_id] for device_id in positions if device_id in sent
+        }
+
+    async def _async_send_batch(self, deadline: float) -> None:
+        """Send the collected commands once the burst is over."""
+        while (delay := min(self._send_at, deadline) - self.hass.loop.time()) > 0:
+            await asyncio.sleep(delay)
+        batch, self._batch = self._batch, None
+        pending, self._pending = self._pending, {}
+
+        positions, skipped = self.coordinator.filter_commands(pending)
+        if skipped:
+            LOGGER.debug("%s - dropped commands: %s", DOMAIN, skipped)
+
+        try:
+            if positions:
+                await self.coordinator.client.setPositions(positions)
+        except Exception as ex:
+            batch.set_exception(ex)
+        else:
+            batch.set_result(positions)
+
+
+class SmartSlydrCoverBase(CoverEntity):
+    """Commands and motion state shared by device and group covers."""
 
-class SmartSlydrCover(SmartSlydrEntity, CoverEntity):  # noqa: D101
     _attr_device_class = CoverDeviceClass.WINDOW
     _attr_supported_features = (
         CoverEntityFeature.OPEN
         | CoverEntityFeature.CLOSE
         | CoverEntityFeature.SET_POSITION
     )
+    _unsub_interpolation = None
+
+    coordinator: SmartSlydrCloudUpdateCoordinator
+    batcher: SmartSlydrCommandBatcher
+
+    @property
+    @abstractmethod
+    def device_ids(self) -> list[str]:
+        """Return the devices moved by this cover."""
+
+    @property
+    def is_closing(self) -> bool:
+        """Return if the cover is closing or not."""
+        return any(
+            self.coordinator.motion_direction(device_id) < 0
+            for device_id in self.device_ids
+        )
+
+    @property
+    def is_opening(self) -> bool:
+        """Return if the cover is opening or not."""
+        return any(
+            self.coordinator.motion_direction(device_id) > 0
+            for device_id in self.device_ids
+        )
+
+    @property
+    def should_poll(self) -> bool:  # noqa: D102
+        return False
+
+    async def async_open_cover(self, **kwargs: Any) -> None:
+        """Open the cover."""
+        await self._async_move(100)
+
+    async def async_close_cover(self, **kwargs: Any) -> None:
+        """Close the cover."""
+        await self._async_move(0)
+
+    async def async_set_cover_position(self, **kwargs: Any) -> None:
+        """Set the cover to a specific position."""
+        await self._async_move(kwargs[ATTR_POSITION])
+
+    async def _async_move(self, position: int) -> None:
+        """Send a position command to all devices and follow the movement.
+
+        Devices that are offline or already at `position` are skipped without
+        a request; if every device is offline, the command fails at once.
+        """
+        positions, skipped = self.coordinator.filter_commands(
+            dict.fromkeys(self.device_ids, position)
+        )
+        # A skipped command replaces unsent ones as well, e.g. a slider
+        # dragged back to the current position moves nothing
+        self.batcher.async_cancel(skipped)
+        if not positions:
+            if skipped and all(
+                reason == COMMAND_SKIPPED_OFFLINE for reason in skipped.values()
+            ):
+                raise HomeAssistantError(f"{self.name} is offline")
+            return
+
+        try:
+            targets = await self.batcher.async_set_positions(positions)
+        except LycheeThingsApiClientError as err:
+            raise HomeAssistantError(f"Failed to move {self.name}: {err}") from err
+
+        if not targets:
+            return
+        for device_id, target in targets.items():
+            self.coordinator.async_track_motion(device_id, target)
+        # Device and group covers of the moved devices, including this one,
+        # show the movement and start interpolating
+        self.coordinator.async_notify_devices(targets)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop refreshing the interpolated position."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_interpolation is not None:
+            self._unsub_interpolation()
+            self._unsub_interpolation = None
 
+    @callback
+    def _async_schedule_interpolation(self) -> None:
+        """Write the estimated position regularly while the cover moves."""
+        if self._unsub_interpolation is not None or all(
+            self.coordinator.estimated_position(device_id) is None
+            for device_id in self.device_ids
+        ):
+            return
+
+        @callback
+        def _interpolate(_now) -> None:
+            self._unsub_interpolation = None
+            self.async_write_ha_state()
+            self._async_schedule_interpolation()
+
+        self._unsub_interpolation = async_call_later(
+            self.hass, INTERPOLATION_INTERVAL, _interpolate
+        )
+
+
+class SmartSlydrCover(SmartSlydrEntity, SmartSlydrCoverBase):  # noqa: D101
     def __init__(
         self,
         hass,
         coordinator: SmartSlydrCloudUpdateCoordinator,
         entry,
         device,
+        batcher: SmartSlydrCommandBatcher,
     ) -> None:
         """Initialize the cover."""
 
         super().__init__(coordinator, device.device_id)
         self.entry = entry
+        self.batcher = batcher
         self._roller = device
-        # Create "moving" information
-        self._roller.moving = 0
         self.hass = hass
 
 
@@ -57,10 +299,10 @@ class SmartSlydrCover(SmartSlydrEntity, CoverEntity):  # noqa: D101
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        LOGGER.debug(
-            f"{DOMAIN} - should update!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!"  # noqa: G003
-            + str(self.coordinator.data)
-        )
+        if self._roller.device_id not in self.coordinator.data:
+            # Removed from the account, the coordinator removes the entity
+            return
+        LOGGER.debug("%s - %s updated", DOMAIN, self._roller.device_id)
 
         # Update from coordinator; position only changes when movement has stopped
         # and the API returns new data
@@ -74,66 +316,116 @@ class SmartSlydrCover(SmartSlydrEntity, CoverEntity):  # noqa: D101
             self._roller.device_id
         ].wlansignal
         self._roller.status = self.coordinator.data[self._roller.device_id].status
-        self._roller.moving = 0
         self.async_write_ha_state()
+        self._async_schedule_interpolation()
+
+    @property
+    def device_ids(self) -> list[str]:
+        """Return the device of this cover."""
+        return [self._roller.device_id]
 
     # This property is important to let HA know if this entity is online or not.
     # If an entity is offline (return False), the UI will reflect this.
     @property
     def available(self) -> bool:
         """Return True if device is available."""
-        return self._roller.status == "device is online"
+        return self._roller.status == DEVICE_ONLINE
 
     # The following properties are how HA knows the current state of the device.
     @property
     def current_cover_position(self):
-        """Return the current position of the cover."""
-        return self._roller.position
+        """Return the current position of the cover.
+
+        While the cover moves, the position is estimated from its learned
+        travel speed until the cloud reports the final one.
+        """
+        estimate = self.coordinator.estimated_position(self._roller.device_id)
+        return self._roller.position if estimate is None else estimate
 
     @property
     def is_closed(self) -> bool:
         """Return if the cover is closed, same as position 0."""
-        return self._roller.position == 0
+        return self.current_cover_position == 0
 
-    @property
-    def is_closing(self) -> bool:
-        """Return if the cover is closing or not."""
-        return self._roller.moving < 0
 
-    @property
-    def is_opening(self) -> bool:
-        """Return if the cover is opening or not."""
-        return self._roller.moving > 0
+class SmartSlydrGroupCover(
+    SmartSlydrStaleMixin, CoordinatorEntity, SmartSlydrCoverBase
+):
+    """Cover moving all devices of a room, or of the account, at once.
 
-    @property
-    def should_poll(self) -> bool:  # noqa: D102
-        return False
+    The state is aggregated from the coordinator data and a command is sent
+    to all devices with a single request.
+    """
 
-    async def async_open_cover(self, **kwargs: Any) -> None:
-        """Open the cover."""
-        await self.coordinator.client.setPosition(self._roller.device_id, 100)
-        self._roller.moving = 1
-        self.async_write_ha_state()
-        await self.coordinator.async_request_refresh()
+    _attr_attribution = ATTRIBUTION
 
-    async def async_close_cover(self, **kwargs: Any) -> None:
-        """Close the cover."""
-        await self.coordinator.client.setPosition(self._roller.device_id, 0)
-        self._roller.moving = -1
-        self.async_write_ha_state()
-        await self.coordinator.async_request_refresh()
+    def __init__(
+        self,
+        coordinator: SmartSlydrCloudUpdateCoordinator,
+        entry,
+        batcher: SmartSlydrCommandBatcher,
+        room_id: str | None = None,
+    ) -> None:
+        """Initialize the group cover; without `room_id` it moves all devices."""
+        super().__init__(coordinator)
+        self.entry = entry
+        self.batcher = batcher
+        self.room_id = room_id
 
-    async def async_set_cover_position(self, **kwargs: Any) -> None:
-        """Set the cover to a specific position."""
-        await self.coordinator.client.setPosition(
-            self._roller.device_id,
-            kwargs[ATTR_POSITION],
-        )
-        if self._roller.position > kwargs[ATTR_POSITION]:
-            self._roller.moving = -1
-        elif self._roller.position < kwargs[ATTR_POSITION]:
-            self._roller.moving = 1
+        if room_id is None:
+            self._attr_unique_id = f"{entry.entry_id}_all_cover"
+            self._attr_name = "All windows"
         else:
-            self._roller.moving = 0
+            self._attr_unique_id = f"{entry.entry_id}_room_{room_id}_cover"
+            self._attr_name = next(
+                device.room_name
+                for device in coordinator.data.values()
+                if device.room_id == room_id
+            )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
         self.async_write_ha_state()
-        await self.coordinator.async_request_refresh()
+        self._async_schedule_interpolation()
+
+    @property
+    def device_ids(self) -> list[str]:
+        """Return the devices of the room, or all devices."""
+        return [
+            device_id
+            for device_id, device in self.coordinator.data.items()
+            if self.room_id is None or device.room_id == self.room_id
+        ]
+
+    @property
+    def available(self) -> bool:
+        """Return True if any device of the group is available."""
+        return self.coordinator.data_available and any(
+            self.coordinator.is_device_online(device_id)
+            for device_id in self.device_ids
+        )
+
+    @property
+    def current_cover_position(self) -> int | None:
+        """Return the average position of the devices."""
+        positions = self._positions()
+        return round(sum(positions) / len(positions)) if positions else None
+
+    @property
+    def is_closed(self) -> bool | None:
+        """Return if all devices are closed."""
+        positions = self._positions()
+        return all(position == 0 for position in positions) if positions else None
+
+    def _positions(self) -> list[int]:
+        """Return the current or estimated positions of the devices."""
+        positions = []
+        for device_id in self.device_ids:
+            estimate = self.coordinator.estimated_position(device_id)
+            positions.append(
+                self.coordinator.data[device_id].position
+                if estimate is None
+                else estimate
+            )
+        return positions
@@ -0,0 +1,54 @@
+"""Diagnostics support for smartslydr_cloud."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import SmartSlydrCloudUpdateCoordinator
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, "title"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Request counts and latencies by endpoint and the poll durations show
+    whether time is spent in the cloud or in Home Assistant.
+    """
+    coordinator: SmartSlydrCloudUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.client
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "polls": coordinator.poll_stats.as_dict(),
+            "moving": coordinator.is_moving,
+            "travel_speeds": coordinator.travel_speeds,
+            "skipped_commands": coordinator.skipped_commands,
+        },
+        "client": {
+            "circuit_state": client.circuit_state,
+            "circuit_retry_in": round(client.circuit_retry_in, 1),
+            "scheduler": {
+                "active": client.scheduler.active,
+                "queued": client.scheduler.queued,
+                "superseded": client.scheduler.superseded,
+            },
+            "requests": {
+                endpoint: stats.as_dict() for endpoint, stats in client.stats.items()
+            },
+        },
+        "devices": [asdict(device) for device in (coordinator.data or {}).values()],
+    }
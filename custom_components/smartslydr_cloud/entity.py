@@ -1,25 +1,140 @@
 """SmartSlydrEntity class."""
 from __future__ import annotations
 
-from homeassistant.helpers.entity import DeviceInfo
+from abc import abstractmethod
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTRIBUTION, DOMAIN, NAME, VERSION
-from .coordinator import SmartSlydrCloudUpdateCoordinator
+from .api import SmartSlydrDevice
+from .const import ATTR_STALE, ATTRIBUTION, NAME, VERSION
+from .coordinator import SmartSlydrCloudUpdateCoordinator, device_identifier
+
+
+@callback
+def async_setup_device_entities(
+    entry: ConfigEntry,
+    coordinator: SmartSlydrCloudUpdateCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    create_entities: Callable[[SmartSlydrDevice], Iterable[Entity]],
+) -> None:
+    """Add the entities of every device, including devices paired later.
+
+    Entities of removed devices are removed with their device registry entry
+    by the coordinator; devices missing from a poll keep their entities until
+    then.
+    """
+    known: set[str] = set()
+
+    @callback
+    def _async_add_new_devices() -> None:
+        if not coordinator.data:
+            return
+        known.difference_update(
+            [
+                device_id
+                for device_id in known
+                if device_id not in coordinator.data
+                and not coordinator.is_device_missing(device_id)
+            ]
+        )
+        new_devices = [
+            device
+            for device_id, device in coordinator.data.items()
+            if device_id not in known
+        ]
+        if not new_devices:
+            return
+        known.update(device.device_id for device in new_devices)
+        async_add_entities(
+            entity for device in new_devices for entity in create_entities(device)
+        )
+
+    _async_add_new_devices()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new_devices))
+
+
+class SmartSlydrStaleMixin:
+    """Mixin for entities showing the data of a SmartSlydr coordinator."""
+
+    coordinator: SmartSlydrCloudUpdateCoordinator
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark states restored from the cache until a poll confirmed them."""
+        return {ATTR_STALE: True} if self.coordinator.is_stale else None
 
-class SmartSlydrEntity(CoordinatorEntity):
+
+class SmartSlydrEntity(SmartSlydrStaleMixin, CoordinatorEntity):
     """SmartSlydrEntity class."""
 
     _attr_attribution = ATTRIBUTION
 
-    def __init__(self, coordinator: SmartSlydrCloudUpdateCoordinator, device_id: str) -> None:
+    def __init__(
+        self,
+        coordinator: SmartSlydrCloudUpdateCoordinator,
+        device_id: str,
+        key: str = "cover",
+    ) -> None:
         """Initialize."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{device_id}_cover"
+        super().__init__(coordinator, context=device_id)
+        self._attr_unique_id = f"{device_id}_{key}"
+        # All entities of a device share the device registered by its cover
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self.unique_id)},
+            identifiers={device_identifier(device_id)},
             name=NAME,
             model=VERSION,
             manufacturer=NAME,
         )
+
+
+class SmartSlydrDeviceStateEntity(SmartSlydrEntity):
+    """Entity whose state is derived from the data of one device.
+
+    The state is only written when it changed significantly, so polls that
+    changed other fields of the device do not reach the recorder.
+    """
+
+    def __init__(
+        self,
+        coordinator: SmartSlydrCloudUpdateCoordinator,
+        device: SmartSlydrDevice,
+        key: str,
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator, device.device_id, key)
+        self._device_id = device.device_id
+        self._update_from_device(device)
+        self._written: tuple[bool, bool] | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return True if the device is online."""
+        return self.coordinator.data_available and self.coordinator.is_device_online(
+            self._device_id
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if it changed significantly."""
+        if self._device_id not in self.coordinator.data:
+            # Removed from the account, the coordinator removes the entity
+            return
+        changed = self._update_from_device(self.coordinator.data[self._device_id])
+        if changed or self._written != (self.available, self.coordinator.is_stale):
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember the availability written."""
+        self._written = (self.available, self.coordinator.is_stale)
+        super().async_write_ha_state()
+
+    @abstractmethod
+    def _update_from_device(self, device: SmartSlydrDevice) -> bool:
+        """Take the state from `device`; return True if it changed significantly."""
@@ -0,0 +1,240 @@
+"""Sensor platform for SmartSlydr."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .api import LycheeThingsCircuitBreaker, SmartSlydrDevice
+from .const import ATTRIBUTION, DOMAIN
+from .coordinator import SmartSlydrCloudUpdateCoordinator
+from .entity import SmartSlydrDeviceStateEntity, async_setup_device_entities
+
+
+@dataclass
+class SmartSlydrSensorEntityDescriptionMixin:
+    """Required keys of a SmartSlydr sensor."""
+
+    value_fn: Callable[[SmartSlydrDevice], int | None]
+
+
+@dataclass
+class SmartSlydrSensorEntityDescription(
+    SensorEntityDescription, SmartSlydrSensorEntityDescriptionMixin
+):
+    """Describes a SmartSlydr sensor.
+
+    Changes smaller than `significant_change` are not written.
+    """
+
+    significant_change: float | None = None
+
+
+SENSORS: tuple[SmartSlydrSensorEntityDescription, ...] = (
+    SmartSlydrSensorEntityDescription(
+        key="temperature",
+        name="Temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        value_fn=lambda device: device.temperature,
+        significant_change=0.5,
+    ),
+    SmartSlydrSensorEntityDescription(
+        key="humidity",
+        name="Humidity",
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda device: device.humidity,
+        significant_change=2,
+    ),
+    SmartSlydrSensorEntityDescription(
+        key="wlansignal",
+        name="Wi-Fi signal",
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda device: device.wlansignal,
+        significant_change=3,
+    ),
+)
+
+
+@dataclass
+class SmartSlydrAccountSensorEntityDescriptionMixin:
+    """Required keys of a SmartSlydr account sensor."""
+
+    value_fn: Callable[[SmartSlydrCloudUpdateCoordinator], StateType]
+
+
+@dataclass
+class SmartSlydrAccountSensorEntityDescription(
+    SensorEntityDescription, SmartSlydrAccountSensorEntityDescriptionMixin
+):
+    """Describes a sensor about the cloud connection of an account."""
+
+    entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+
+
+def _mean_latency(coordinator: SmartSlydrCloudUpdateCoordinator) -> float | None:
+    """Return the mean latency of all requests in milliseconds."""
+    stats = coordinator.client.stats.values()
+    if not (count := sum(endpoint.count for endpoint in stats)):
+        return None
+    return round(sum(endpoint.total_time for endpoint in stats) / count * 1000, 1)
+
+
+ACCOUNT_SENSORS: tuple[SmartSlydrAccountSensorEntityDescription, ...] = (
+    SmartSlydrAccountSensorEntityDescription(
+        key="cloud_requests",
+        name="Cloud requests",
+        icon="mdi:cloud-upload",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: sum(
+            endpoint.count for endpoint in coordinator.client.stats.values()
+        ),
+    ),
+    SmartSlydrAccountSensorEntityDescription(
+        key="cloud_errors",
+        name="Cloud errors",
+        icon="mdi:cloud-alert",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: sum(
+            endpoint.errors for endpoint in coordinator.client.stats.values()
+        ),
+    ),
+    SmartSlydrAccountSensorEntityDescription(
+        key="skipped_commands",
+        name="Skipped commands",
+        icon="mdi:cloud-cancel",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: sum(coordinator.skipped_commands.values()),
+    ),
+    SmartSlydrAccountSensorEntityDescription(
+        key="cloud_latency",
+        name="Cloud latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=_mean_latency,
+    ),
+    SmartSlydrAccountSensorEntityDescription(
+        key="poll_duration",
+        name="Poll duration",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: round(
+            coordinator.poll_stats.last_time * 1000, 1
+        ),
+    ),
+    SmartSlydrAccountSensorEntityDescription(
+        key="circuit_state",
+        name="Cloud circuit",
+        device_class=SensorDeviceClass.ENUM,
+        options=[
+            LycheeThingsCircuitBreaker.CLOSED,
+            LycheeThingsCircuitBreaker.OPEN,
+            LycheeThingsCircuitBreaker.HALF_OPEN,
+        ],
+        value_fn=lambda coordinator: coordinator.client.circuit_state,
+    ),
+)
+
+
+async def async_setup_entry(hass, entry, async_add_devices):
+    """Set up the sensor platform."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_devices(
+        SmartSlydrAccountSensor(coordinator, entry, description)
+        for description in ACCOUNT_SENSORS
+    )
+    async_setup_device_entities(
+        entry,
+        coordinator,
+        async_add_devices,
+        lambda device: [
+            SmartSlydrSensor(coordinator, device, description)
+            for description in SENSORS
+        ],
+    )
+
+
+class SmartSlydrSensor(SmartSlydrDeviceStateEntity, SensorEntity):
+    """Sensor reporting a value from the device list."""
+
+    entity_description: SmartSlydrSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: SmartSlydrCloudUpdateCoordinator,
+        device: SmartSlydrDevice,
+        description: SmartSlydrSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._attr_native_value = None
+        super().__init__(coordinator, device, description.key)
+        self._attr_name = f"{device.devicename} {description.name}"
+
+    def _update_from_device(self, device: SmartSlydrDevice) -> bool:
+        """Take the value from `device`; return True if it changed significantly."""
+        value = self.entity_description.value_fn(device)
+        previous = self._attr_native_value
+        threshold = self.entity_description.significant_change
+        if value == previous or (
+            threshold is not None
+            and value is not None
+            and previous is not None
+            and abs(value - previous) < threshold
+        ):
+            return False
+        self._attr_native_value = value
+        return True
+
+
+class SmartSlydrAccountSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor about the cloud connection of an account."""
+
+    _attr_attribution = ATTRIBUTION
+    entity_description: SmartSlydrAccountSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: SmartSlydrCloudUpdateCoordinator,
+        entry,
+        description: SmartSlydrAccountSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_name = f"{entry.title} {description.name}"
+
+    @property
+    def available(self) -> bool:
+        """Return True, the sensor reports on failing polls as well."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
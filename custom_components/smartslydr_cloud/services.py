@@ -0,0 +1,143 @@
+"""Services for smartslydr_cloud."""
+from __future__ import annotations
+
+import asyncio
+
+import voluptuous as vol
+from homeassistant.components.cover import DOMAIN as COVER_DOMAIN
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .api import LycheeThingsApiClientError
+from .const import COMMAND_SKIPPED_OFFLINE, COMMAND_SKIPPED_UNCHANGED, DOMAIN, LOGGER
+from .coordinator import SmartSlydrCloudUpdateCoordinator
+from .cover import SmartSlydrCoverBase
+
+SERVICE_SET_POSITIONS = "set_positions"
+ATTR_POSITIONS = "positions"
+
+RESULT_SENT = "sent"
+RESULT_UNCHANGED = COMMAND_SKIPPED_UNCHANGED
+RESULT_OFFLINE = COMMAND_SKIPPED_OFFLINE
+RESULT_FAILED = "failed"
+
+SET_POSITIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_POSITIONS): vol.All(
+            {cv.string: vol.All(vol.Coerce(int), vol.Range(min=0, max=100))},
+            vol.Length(min=1),
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    if hass.services.has_service(DOMAIN, SERVICE_SET_POSITIONS):
+        return
+
+    async def _async_set_positions(call: ServiceCall) -> ServiceResponse:
+        """Move several covers or devices, one request per account."""
+        commands = _resolve_targets(hass, call.data[ATTR_POSITIONS])
+        results: dict[str, str] = {}
+        for account_results in await asyncio.gather(
+            *(
+                _async_send(coordinator, positions)
+                for coordinator, positions in commands.items()
+            )
+        ):
+            results.update(account_results)
+
+        if not call.return_response and RESULT_FAILED in results.values():
+            raise HomeAssistantError(
+                "Failed to move "
+                + ", ".join(
+                    device_id
+                    for device_id, result in results.items()
+                    if result == RESULT_FAILED
+                )
+            )
+        return {"results": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_POSITIONS,
+        _async_set_positions,
+        schema=SET_POSITIONS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services once the last entry was unloaded."""
+    if not hass.data.get(DOMAIN):
+        hass.services.async_remove(DOMAIN, SERVICE_SET_POSITIONS)
+
+
+def _resolve_targets(
+    hass: HomeAssistant, positions: dict[str, int]
+) -> dict[SmartSlydrCloudUpdateCoordinator, dict[str, int]]:
+    """Map cover entities and device ids to the devices of each account.
+
+    Later targets override earlier ones, e.g. a room cover followed by one
+    of its devices.
+    """
+    coordinators = list(hass.data.get(DOMAIN, {}).values())
+    component = hass.data.get(COVER_DOMAIN)
+    commands: dict[SmartSlydrCloudUpdateCoordinator, dict[str, int]] = {}
+    unknown = []
+
+    for target, position in positions.items():
+        entity = component.get_entity(target) if component is not None else None
+        if isinstance(entity, SmartSlydrCoverBase):
+            coordinator, device_ids = entity.coordinator, entity.device_ids
+        elif coordinator := next(
+            (
+                coordinator
+                for coordinator in coordinators
+                if coordinator.data and target in coordinator.data
+            ),
+            None,
+        ):
+            device_ids = [target]
+        else:
+            unknown.append(target)
+            continue
+        commands.setdefault(coordinator, {}).update(dict.fromkeys(device_ids, position))
+
+    if unknown:
+        raise HomeAssistantError(
+            f"Unknown SmartSlydr covers or devices: {', '.join(unknown)}"
+        )
+    return commands
+
+
+async def _async_send(
+    coordinator: SmartSlydrCloudUpdateCoordinator, positions: dict[str, int]
+) -> dict[str, str]:
+    """Send the commands of one account with a single request."""
+    send, results = coordinator.filter_commands(positions)
+    if not send:
+        return results
+
+    try:
+        await coordinator.client.setPositions(send)
+    except LycheeThingsApiClientError as exception:
+        LOGGER.warning("%s - %s failed: %s", DOMAIN, SERVICE_SET_POSITIONS, exception)
+        results.update(dict.fromkeys(send, RESULT_FAILED))
+        return results
+
+    for device_id, position in send.items():
+        coordinator.async_track_motion(device_id, position)
+    coordinator.async_notify_devices(send)
+    results.update(dict.fromkeys(send, RESULT_SENT))
+    return results
@@ -0,0 +1,108 @@
+"""Shared HTTP session and API clients for smartslydr_cloud.
+
+All config entries and config flows talk to the same LycheeThings host, so
+they share one session whose connections are kept alive between requests
+and one scheduler that caps concurrent requests and sends commands first.
+Entries of the same account share one client and thereby its tokens.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import ssl as ssl_util
+
+from .api import LycheeThingsApiClient, LycheeThingsRequestScheduler
+from .const import (
+    DOMAIN,
+    LOGGER,
+    MAX_CONCURRENT_REQUESTS,
+    SESSION_CONNECTION_LIMIT,
+    SESSION_DNS_CACHE_TTL,
+    SESSION_KEEPALIVE_TIMEOUT,
+)
+
+DATA_SESSION = f"{DOMAIN}_session"
+
+
+@dataclass
+class _SharedSession:
+    """The session of this integration and the clients using it."""
+
+    session: aiohttp.ClientSession
+    unsub_close: CALLBACK_TYPE
+    scheduler: LycheeThingsRequestScheduler = field(
+        default_factory=lambda: LycheeThingsRequestScheduler(MAX_CONCURRENT_REQUESTS)
+    )
+    clients: dict[tuple[str, str], LycheeThingsApiClient] = field(
+        default_factory=dict
+    )
+    users: dict[tuple[str, str], int] = field(default_factory=dict)
+
+
+@callback
+def async_acquire_client(
+    hass: HomeAssistant, username: str, password: str
+) -> LycheeThingsApiClient:
+    """Return the client of an account; release it with async_release_client."""
+    shared = _async_get_shared(hass)
+    key = (username, password)
+    if (client := shared.clients.get(key)) is None:
+        client = shared.clients[key] = LycheeThingsApiClient(
+            username=username,
+            password=password,
+            session=shared.session,
+            scheduler=shared.scheduler,
+        )
+    shared.users[key] = shared.users.get(key, 0) + 1
+    return client
+
+
+async def async_release_client(
+    hass: HomeAssistant, client: LycheeThingsApiClient
+) -> None:
+    """Stop using `client`; the session is closed with its last client."""
+    if (shared := hass.data.get(DATA_SESSION)) is None:
+        return
+
+    for key, candidate in list(shared.clients.items()):
+        if candidate is client:
+            shared.users[key] -= 1
+            if not shared.users[key]:
+                del shared.clients[key], shared.users[key]
+
+    if not shared.clients:
+        del hass.data[DATA_SESSION]
+        shared.unsub_close()
+        await shared.session.close()
+        LOGGER.debug("%s - closed the shared session", DOMAIN)
+
+
+@callback
+def _async_get_shared(hass: HomeAssistant) -> _SharedSession:
+    """Return the shared session, creating it on first use."""
+    if (shared := hass.data.get(DATA_SESSION)) is not None:
+        return shared
+
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            ssl=ssl_util.get_default_context(),
+            limit=SESSION_CONNECTION_LIMIT,
+            ttl_dns_cache=SESSION_DNS_CACHE_TTL,
+            keepalive_timeout=SESSION_KEEPALIVE_TIMEOUT,
+        ),
+        json_serialize=json_dumps,
+    )
+
+    async def _async_close(event: Event) -> None:
+        hass.data.pop(DATA_SESSION, None)
+        await session.close()
+
+    shared = hass.data[DATA_SESSION] = _SharedSession(
+        session=session,
+        unsub_close=hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close),
+    )
+    return shared
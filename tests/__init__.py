@@ -0,0 +1 @@
+"""Tests for the smartslydr_cloud integration."""
@@ -0,0 +1,170 @@
+"""Tests for the LycheeThings API client."""
+from __future__ import annotations
+
+import asyncio
+
+from aiohttp import ClientSession, web
+import pytest
+
+from custom_components.smartslydr_cloud.api import (
+    LycheeThingsApiClient,
+    LycheeThingsApiClientError,
+    LycheeThingsRequestScheduler,
+    SmartSlydrDevice,
+)
+
+DEVICE = {
+    "device_id": "a",
+    "devicename": "Patio door",
+    "petpass": "off",
+    "room_name": "Living room",
+    "room_id": 1,
+    "wlansignal": "-52",
+    "temperature": 21,
+    "humidity": 40,
+    "position": 30,
+    "error": "",
+    "status": "device is online",
+}
+
+
+def test_decode_device() -> None:
+    """Fields are coerced to the types of SmartSlydrDevice."""
+    device = SmartSlydrDevice.from_dict({**DEVICE, "unknown": True})
+    assert device.room_id == "1"
+    assert device.wlansignal == -52
+    assert device.position == 30
+
+
+def test_decode_fractional_reading() -> None:
+    """Fractional readings are truncated instead of failing the poll."""
+    device = SmartSlydrDevice.from_dict(
+        {**DEVICE, "temperature": 21.5, "humidity": 40.0}
+    )
+    assert device.temperature == 21
+    assert device.humidity == 40
+
+
+@pytest.mark.parametrize(
+    ("field", "value"), [("position", None), ("position", "half"), ("humidity", True)]
+)
+def test_decode_invalid_field(field: str, value) -> None:
+    """A malformed field raises ValueError naming the field."""
+    with pytest.raises(ValueError, match=field):
+        SmartSlydrDevice.from_dict({**DEVICE, field: value})
+
+
+def test_decode_missing_field() -> None:
+    """A missing field raises ValueError."""
+    data = dict(DEVICE)
+    del data["status"]
+    with pytest.raises(ValueError, match="status"):
+        SmartSlydrDevice.from_dict(data)
+
+
+class _Cloud:
+    """Minimal LycheeThings cloud answering `/devices` slowly."""
+
+    def __init__(self, devices_delay: float) -> None:
+        """Initialize."""
+        self.devices_delay = devices_delay
+        self.requests: list[str] = []
+        self.answers: list[dict] = [{"device_id": "a", "position": 40}]
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Answer a request, device "a" is at 30 in the device list."""
+        self.requests.append(request.path)
+        if request.path == "/devices":
+            await asyncio.sleep(self.devices_delay)
+            return web.json_response(
+                {"room_lists": [{"device_list": [{**DEVICE, "position": 30}]}]}
+            )
+        return web.json_response({"response": self.answers})
+
+
+def _run_cloud(cloud: _Cloud, test, count: int = 1):
+    """Run `test` with `count` clients of `cloud` sharing one scheduler."""
+
+    async def _async_run():
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", cloud.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        scheduler = LycheeThingsRequestScheduler(2)
+        async with ClientSession() as session:
+            clients = []
+            for index in range(count):
+                client = LycheeThingsApiClient(
+                    f"user{index}", "password", session, scheduler=scheduler
+                )
+                client.base_url = f"http://127.0.0.1:{port}/"
+                client.restore_tokens({"access_token": "token", "expires": 1e12})
+                clients.append(client)
+            try:
+                return await test(*clients)
+            finally:
+                await runner.cleanup()
+
+    return asyncio.run(_async_run())
+
+
+def test_positions_from_sent_device_list() -> None:
+    """A position read joins a device list download already sent."""
+    cloud = _Cloud(devices_delay=0.1)
+
+    async def _test(client: LycheeThingsApiClient) -> dict[str, int]:
+        poll = asyncio.ensure_future(client.getDeviceList())
+        await asyncio.sleep(0.05)
+        positions = await client.getCurrentPositions(["a"])
+        await poll
+        return positions
+
+    assert _run_cloud(cloud, _test) == {"a": 30}
+    assert cloud.requests == ["/devices"]
+
+
+def test_positions_before_queued_device_list() -> None:
+    """A position read does not wait for a device list download still queued."""
+    cloud = _Cloud(devices_delay=0.1)
+
+    async def _test(
+        client: LycheeThingsApiClient, other: LycheeThingsApiClient
+    ) -> dict[str, int]:
+        # The poll of the other account takes the only slot left for polls
+        other_poll = asyncio.ensure_future(other.getDeviceList())
+        await asyncio.sleep(0.02)
+        poll = asyncio.ensure_future(client.getDeviceList())
+        await asyncio.sleep(0.02)
+        positions = await client.getCurrentPositions(["a"])
+        await asyncio.gather(other_poll, poll)
+        return positions
+
+    assert _run_cloud(cloud, _test, count=2) == {"a": 40}
+    assert cloud.requests == ["/devices", "/operation/get", "/devices"]
+
+
+def test_positions_matched_by_order() -> None:
+    """Answers without device_id belong to the devices in requested order."""
+    cloud = _Cloud(devices_delay=0)
+    cloud.answers = [{"position": 10}, {"position": 20}]
+
+    async def _test(client: LycheeThingsApiClient) -> dict[str, int]:
+        return await client.getCurrentPositions(["a", "b"])
+
+    assert _run_cloud(cloud, _test) == {"a": 10, "b": 20}
+
+
+def test_positions_missing_answer() -> None:
+    """Answers without device_id are rejected if one is left out."""
+    cloud = _Cloud(devices_delay=0)
+    cloud.answers = [{"position": 20}]
+
+    async def _test(client: LycheeThingsApiClient) -> None:
+        with pytest.raises(LycheeThingsApiClientError):
+            await client.getCurrentPositions(["a", "b"])
+
+    _run_cloud(cloud, _test)
@@ -0,0 +1,33 @@
+"""Tests for the smartslydr_cloud binary sensor platform."""
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from custom_components.smartslydr_cloud.binary_sensor import BINARY_SENSORS
+
+from .test_cover import _device
+
+PETPASS = next(
+    description for description in BINARY_SENSORS if description.key == "petpass"
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "is_on"),
+    [
+        ("on", True),
+        ("ON", True),
+        ("1", True),
+        ("off", False),
+        ("0", False),
+        ("false", False),
+        ("enabled", None),
+        ("", None),
+    ],
+)
+def test_petpass(value: str, is_on: bool | None) -> None:
+    """Only known encodings of the pet pass mode are reported."""
+    device = dataclasses.replace(_device("a", 0), petpass=value)
+    assert PETPASS.is_on_fn(device) is is_on
@@ -0,0 +1,130 @@
+"""Tests for the smartslydr_cloud update coordinator."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.smartslydr_cloud import coordinator as coordinator_module
+from custom_components.smartslydr_cloud.coordinator import (
+    SmartSlydrCloudUpdateCoordinator,
+)
+
+
+class _Clock:
+    """Monotonic clock advanced by the tests."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    """Replace the monotonic clock of the coordinator."""
+    clock = _Clock()
+    monkeypatch.setattr(coordinator_module.time, "monotonic", clock)
+    return clock
+
+
+def _run(tmp_path, test: Callable[[SmartSlydrCloudUpdateCoordinator], None]) -> None:
+    """Run `test` with a coordinator that knows device "a" at position 0."""
+
+    async def _async_run() -> None:
+        hass = HomeAssistant()
+        hass.config.config_dir = str(tmp_path)
+        coordinator = SmartSlydrCloudUpdateCoordinator(hass, None, 60)
+        coordinator._async_track_positions({"a": 0})
+        try:
+            test(coordinator)
+        finally:
+            coordinator.async_stop()
+            await hass.async_stop(force=True)
+
+    asyncio.run(_async_run())
+
+
+def test_repeated_read_right_after_check(tmp_path, clock: _Clock) -> None:
+    """A poll repeating the position of a check does not end the motion."""
+
+    def _test(coordinator: SmartSlydrCloudUpdateCoordinator) -> None:
+        coordinator.async_track_motion("a", 100)
+        clock.now += 8
+        coordinator._async_track_positions({"a": 40})
+        clock.now += 0.5
+        coordinator._async_track_positions({"a": 40})
+        assert coordinator.is_device_moving("a")
+
+        clock.now += 5
+        coordinator._async_track_positions({"a": 40})
+        assert not coordinator.is_device_moving("a")
+
+    _run(tmp_path, _test)
+
+
+def test_stopped_when_moved_by_app(tmp_path, clock: _Clock) -> None:
+    """A device moved by someone else is followed until it stands still."""
+
+    def _test(coordinator: SmartSlydrCloudUpdateCoordinator) -> None:
+        clock.now += 1
+        coordinator._async_track_positions({"a": 20})
+        assert coordinator.is_device_moving("a")
+        clock.now += 0.5
+        coordinator._async_track_positions({"a": 20})
+        assert coordinator.is_device_moving("a")
+        clock.now += 5
+        coordinator._async_track_positions({"a": 20})
+        assert not coordinator.is_device_moving("a")
+
+    _run(tmp_path, _test)
+
+
+def test_poll_before_check_keeps_it(tmp_path, clock: _Clock) -> None:
+    """A poll before the planned check does not bring the check forward."""
+
+    def _test(coordinator: SmartSlydrCloudUpdateCoordinator) -> None:
+        coordinator._speeds["a"] = 5
+        coordinator.async_track_motion("a", 100)
+        check_at = coordinator._moving["a"].check_at
+        assert check_at == clock.now + 21
+
+        clock.now += 1
+        coordinator._async_track_positions({"a": 0})
+        assert coordinator._moving["a"].check_at == check_at
+
+    _run(tmp_path, _test)
+
+
+def test_learn_speed_while_travelling(tmp_path, clock: _Clock) -> None:
+    """The speed is learned from a device observed on its way."""
+
+    def _test(coordinator: SmartSlydrCloudUpdateCoordinator) -> None:
+        coordinator.async_track_motion("a", 100)
+        clock.now += 5
+        coordinator._async_track_positions({"a": 25})
+        assert coordinator.travel_speeds["a"] == 5
+        assert coordinator.estimated_position("a") == 25
+        clock.now += 2
+        assert coordinator.estimated_position("a") == 35
+
+    _run(tmp_path, _test)
+
+
+def test_learn_speed_on_arrival(tmp_path, clock: _Clock) -> None:
+    """A device found at its target by the first check may be faster."""
+
+    def _test(coordinator: SmartSlydrCloudUpdateCoordinator) -> None:
+        coordinator._speeds["a"] = 5
+        coordinator.async_track_motion("a", 100)
+        clock.now += 21
+        coordinator._async_track_positions({"a": 100})
+        assert not coordinator.is_device_moving("a")
+        assert coordinator.travel_speeds["a"] == pytest.approx(5.5)
+
+    _run(tmp_path, _test)
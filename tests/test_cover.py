@@ -0,0 +1,73 @@
+"""Tests for the smartslydr_cloud cover platform."""
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.smartslydr_cloud.api import SmartSlydrDevice
+from custom_components.smartslydr_cloud.const import DEVICE_ONLINE
+from custom_components.smartslydr_cloud.coordinator import (
+    SmartSlydrCloudUpdateCoordinator,
+)
+from custom_components.smartslydr_cloud.cover import (
+    SmartSlydrCommandBatcher,
+    SmartSlydrCover,
+)
+
+
+class _Client:
+    """API client recording the position commands it sent."""
+
+    username = "user"
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.sent: list[dict[str, int]] = []
+
+    async def setPositions(self, positions: dict[str, int]) -> None:  # noqa: D102
+        self.sent.append(dict(positions))
+
+
+def _device(device_id: str, position: int) -> SmartSlydrDevice:
+    """Return an online device resting at `position`."""
+    return SmartSlydrDevice(
+        device_id=device_id,
+        devicename=device_id,
+        petpass="off",
+        room_name="Room",
+        room_id="room",
+        wlansignal=-50,
+        temperature=20,
+        humidity=40,
+        position=position,
+        error="",
+        status=DEVICE_ONLINE,
+    )
+
+
+def test_slider_dragged_back_sends_nothing(tmp_path) -> None:
+    """A command back to the current position drops the unsent command."""
+
+    async def _run() -> list[dict[str, int]]:
+        hass = HomeAssistant()
+        hass.config.config_dir = str(tmp_path)
+        client = _Client()
+        coordinator = SmartSlydrCloudUpdateCoordinator(hass, client, 60)
+        coordinator.data = {"a": _device("a", 30)}
+        batcher = SmartSlydrCommandBatcher(
+            hass, coordinator, window=0.05, max_delay=0.5
+        )
+        cover = SmartSlydrCover(hass, coordinator, None, coordinator.data["a"], batcher)
+        cover.entity_id = "cover.a"
+
+        async def _drag_back() -> None:
+            await asyncio.sleep(0.01)
+            await cover.async_set_cover_position(position=30)
+
+        await asyncio.gather(cover.async_set_cover_position(position=50), _drag_back())
+        coordinator.async_stop()
+        await hass.async_stop(force=True)
+        return client.sent
+
+    assert asyncio.run(_run()) == []
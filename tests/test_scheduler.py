@@ -0,0 +1,148 @@
+"""Tests for the request scheduler of the LycheeThings API client."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.smartslydr_cloud.api import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    PRIORITY_VERIFY,
+    LycheeThingsApiClientSupersededError,
+    LycheeThingsRequestScheduler,
+)
+
+
+async def _request(
+    scheduler: LycheeThingsRequestScheduler,
+    started: list[str],
+    name: str,
+    priority: int,
+    key: str | None = None,
+    release: asyncio.Event | None = None,
+) -> None:
+    """Hold a slot until `release` is set, or for one loop iteration."""
+    async with scheduler.slot(priority, key):
+        started.append(name)
+        if release is not None:
+            await release.wait()
+        else:
+            await asyncio.sleep(0)
+
+
+def test_priority_order() -> None:
+    """Waiting requests start by priority, then in order of arrival."""
+
+    async def _test() -> list[str]:
+        scheduler = LycheeThingsRequestScheduler(1, reserved=0)
+        started: list[str] = []
+        release = asyncio.Event()
+        tasks = [
+            asyncio.ensure_future(
+                _request(scheduler, started, "running", PRIORITY_POLL, release=release)
+            )
+        ]
+        await asyncio.sleep(0)
+        for name, priority in (
+            ("poll", PRIORITY_POLL),
+            ("verify", PRIORITY_VERIFY),
+            ("command 1", PRIORITY_COMMAND),
+            ("command 2", PRIORITY_COMMAND),
+        ):
+            tasks.append(
+                asyncio.ensure_future(_request(scheduler, started, name, priority))
+            )
+        await asyncio.sleep(0)
+        assert scheduler.queued == 4
+        release.set()
+        await asyncio.gather(*tasks)
+        assert scheduler.active == 0
+        return started
+
+    assert asyncio.run(_test()) == [
+        "running",
+        "command 1",
+        "command 2",
+        "verify",
+        "poll",
+    ]
+
+
+def test_reserved_slot_for_commands() -> None:
+    """Polls cannot take the slots reserved for commands."""
+
+    async def _test() -> list[str]:
+        scheduler = LycheeThingsRequestScheduler(2, reserved=1)
+        started: list[str] = []
+        release = asyncio.Event()
+        tasks = [
+            asyncio.ensure_future(
+                _request(scheduler, started, name, PRIORITY_POLL, release=release)
+            )
+            for name in ("poll 1", "poll 2")
+        ]
+        await asyncio.sleep(0)
+        assert started == ["poll 1"]
+
+        await _request(scheduler, started, "command", PRIORITY_COMMAND)
+        release.set()
+        await asyncio.gather(*tasks)
+        return started
+
+    assert asyncio.run(_test()) == ["poll 1", "command", "poll 2"]
+
+
+def test_superseded_while_waiting() -> None:
+    """A waiting request is superseded by a newer one with the same key."""
+
+    async def _test() -> list[str]:
+        scheduler = LycheeThingsRequestScheduler(1, reserved=0)
+        started: list[str] = []
+        release = asyncio.Event()
+        running = asyncio.ensure_future(
+            _request(scheduler, started, "running", PRIORITY_POLL, release=release)
+        )
+        await asyncio.sleep(0)
+        older = asyncio.ensure_future(
+            _request(scheduler, started, "older", PRIORITY_POLL, key="devices")
+        )
+        await asyncio.sleep(0)
+        newer = asyncio.ensure_future(
+            _request(scheduler, started, "newer", PRIORITY_POLL, key="devices")
+        )
+        await asyncio.sleep(0)
+        with pytest.raises(LycheeThingsApiClientSupersededError):
+            await older
+        release.set()
+        await asyncio.gather(running, newer)
+        assert scheduler.superseded == 1
+        return started
+
+    assert asyncio.run(_test()) == ["running", "newer"]
+
+
+def test_cancelled_while_waiting() -> None:
+    """A request cancelled while waiting does not keep a slot."""
+
+    async def _test() -> None:
+        scheduler = LycheeThingsRequestScheduler(1, reserved=0)
+        started: list[str] = []
+        release = asyncio.Event()
+        running = asyncio.ensure_future(
+            _request(scheduler, started, "running", PRIORITY_POLL, release=release)
+        )
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(
+            _request(scheduler, started, "cancelled", PRIORITY_POLL)
+        )
+        await asyncio.sleep(0)
+        waiting.cancel()
+        release.set()
+        await running
+        await _request(scheduler, started, "next", PRIORITY_POLL)
+        assert started == ["running", "next"]
+        assert scheduler.active == 0
+        assert scheduler.queued == 0
+
+    asyncio.run(_test())